@@ -4,11 +4,19 @@ import os
 import shutil
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from sessionbook.jsonl import CLAUDE_DIR, encode_project_path, discover_sessions
-from sessionbook.html import _existing_session_ids, save_html
+from sessionbook.jsonl import (
+    CLAUDE_DIR,
+    Session,
+    encode_project_path,
+    discover_sessions,
+)
+from sessionbook.html import _existing_session_ids, _html_filenames, save_html
+from sessionbook.util import init_worker_logging
 
 log = logging.getLogger("sessionbook")
 
@@ -31,6 +39,187 @@ def install_signal_handlers(child_pid: int) -> None:
     signal.signal(signal.SIGTERM, _forward_signal)
 
 
+_PREFETCH_INTERVAL = 2.0
+_PREFETCH_THREAD_NAME = "sessionbook-prefetch"
+
+
+# Records logged by the prefetch thread, held back until claude exits
+_held_prefetch_records: list[logging.LogRecord] = []
+
+
+def _hold_prefetch_records(record: logging.LogRecord) -> bool:
+    """Logging filter that holds back records emitted by the prefetch thread.
+
+    The wrapped claude process owns the terminal while the prefetch runs, so
+    its warnings (malformed lines, invalid agent IDs) are kept for
+    _replay_prefetch_records instead of being printed over claude's UI.
+    """
+    if record.threadName != _PREFETCH_THREAD_NAME:
+        return True
+    _held_prefetch_records.append(record)
+    return False
+
+
+def _replay_prefetch_records() -> None:
+    """Emit the records held back from the prefetch thread, once each.
+
+    The final conversion reuses the prefetched parses, so these warnings
+    would otherwise never be shown. A file re-parsed after changing can
+    repeat a warning; duplicates are dropped.
+    """
+    seen: set[tuple[int, str]] = set()
+    for record in _held_prefetch_records:
+        key = (record.levelno, record.getMessage())
+        if key not in seen:
+            seen.add(key)
+            log.handle(record)
+    _held_prefetch_records.clear()
+
+
+def _prefetch_sessions(
+    project_dir: Path, start_time: float, stop: threading.Event
+) -> None:
+    """Periodically parse session files while the child process runs.
+
+    Results land in the jsonl parse cache, so the conversion after exit only
+    re-parses files that changed since the last pass. Only files left
+    untouched for a whole interval are parsed; the live session is appended
+    to constantly and parsing it each pass would be wasted work. Nothing is
+    written to disk here: sessions are still being appended to until claude
+    exits.
+    """
+    previous_stats: dict[Path, tuple[int, int]] = {}
+    while not stop.wait(_PREFETCH_INTERVAL):
+        if not project_dir.is_dir():
+            continue
+        try:
+            discover_sessions(
+                project_dir, start_time, parallel=False, previous_stats=previous_stats
+            )
+        except Exception:
+            log.debug("Session prefetch failed", exc_info=True)
+
+
+def _wait_child_waitpid(child_pid: int) -> int:
+    """Wait for child_pid with waitpid and return its shell-style exit code."""
+    while True:
+        try:
+            _, status = os.waitpid(child_pid, 0)
+            break
+        except OSError as e:
+            if e.errno == errno.EINTR:
+                continue
+            raise
+
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return 1
+
+
+def _wait_child(child_pid: int) -> int:
+    """Wait for child_pid to exit and return its shell-style exit code.
+
+    Waits on a pidfd where the platform supports it (Linux 5.4+), which
+    reaps exactly this child and has no EINTR retry path. Falls back to
+    waitpid elsewhere, including Linux 5.3, where pidfd_open exists but
+    waitid rejects P_PIDFD with EINVAL.
+
+    Returns:
+        Child exit status, or 128 + signal number if it was killed
+    """
+    try:
+        pidfd = os.pidfd_open(child_pid)
+    except (AttributeError, OSError):
+        return _wait_child_waitpid(child_pid)
+
+    try:
+        info = os.waitid(os.P_PIDFD, pidfd, os.WEXITED)
+    except OSError as e:
+        os.close(pidfd)
+        log.debug("waitid on pidfd failed, falling back to waitpid: %s", e)
+        return _wait_child_waitpid(child_pid)
+    os.close(pidfd)
+
+    if info is None:
+        return 1
+    if info.si_code == os.CLD_EXITED:
+        return info.si_status
+    if info.si_code in (os.CLD_KILLED, os.CLD_DUMPED):
+        return 128 + info.si_status
+    return 1
+
+
+# Runs with fewer turns than this in total are saved in-process: starting a
+# pool (and, under spawn, re-importing markdown and Pygments in every worker)
+# costs more than rendering a few hundred turns sequentially.
+_PARALLEL_SAVE_TURN_THRESHOLD = 1000
+
+
+def _save_sessions(
+    sessions: list[Session], output_dir: Path, existing_names: set[str] | None = None
+) -> list[tuple[Session, Path]]:
+    """Save sessions to HTML, fanning out to worker processes when worthwhile.
+
+    Rendering is CPU-bound (markdown and Pygments), so when several sessions
+    together exceed _PARALLEL_SAVE_TURN_THRESHOLD turns each save runs in its
+    own process; smaller runs are saved sequentially. Failures are logged per
+    session and do not stop the others.
+
+    Args:
+        sessions: Sessions to save
+        output_dir: Directory to write HTML files
+        existing_names: File names already taken in output_dir; updated with
+            every name written
+
+    Returns:
+        (session, path) pairs for every session that was written
+    """
+    saved: list[tuple[Session, Path]] = []
+    total_turns = sum(len(session.turns) for session in sessions)
+    if len(sessions) > 1 and total_turns > _PARALLEL_SAVE_TURN_THRESHOLD:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=min(len(sessions), os.cpu_count() or 1),
+                initializer=init_worker_logging,
+                initargs=(log.level, bool(log.handlers)),
+            )
+        except (OSError, NotImplementedError) as e:
+            log.debug("Process pool unavailable, saving sequentially: %s", e)
+        else:
+            with executor:
+                futures = {
+                    executor.submit(
+                        save_html, session, output_dir, existing_names
+                    ): session
+                    for session in sessions
+                }
+                for future in as_completed(futures):
+                    session = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception:
+                        log.exception("Failed to save session %s", session.session_id)
+                        continue
+                    if result is not None:
+                        saved.append((session, result))
+                        # Workers reserve names on a copy of the set
+                        if existing_names is not None:
+                            existing_names.add(result.name)
+            return saved
+
+    for session in sessions:
+        try:
+            result = save_html(session, output_dir, existing_names)
+        except Exception:
+            log.exception("Failed to save session %s", session.session_id)
+            continue
+        if result is not None:
+            saved.append((session, result))
+    return saved
+
+
 def convert_sessions(start_time: float, verbose: bool) -> None:
     """Convert JSONL sessions written since start_time to HTML."""
     cwd = Path.cwd()
@@ -47,7 +236,9 @@ def convert_sessions(start_time: float, verbose: bool) -> None:
         return
 
     output_dir = cwd / ".sessionbook"
-    seen = _existing_session_ids(output_dir)
+    existing_names = _html_filenames(output_dir)
+    seen = _existing_session_ids(output_dir, existing_names)
+    pending: list[Session] = []
     for session in sessions:
         if session.session_id in seen:
             log.info("Skipping already-saved session %s", session.session_id)
@@ -55,13 +246,11 @@ def convert_sessions(start_time: float, verbose: bool) -> None:
         if not session.turns:
             log.info("Skipping empty session %s", session.session_id)
             continue
-        try:
-            result = save_html(session, output_dir)
-            if result:
-                seen.add(session.session_id)
-                log.info("Saved %s", result.name)
-        except Exception:
-            log.exception("Failed to save session %s", session.session_id)
+        seen.add(session.session_id)
+        pending.append(session)
+
+    for _, result in _save_sessions(pending, output_dir, existing_names):
+        log.info("Saved %s", result.name)
 
 
 def run_claude(args: list[str], verbose: bool) -> int:
@@ -91,23 +280,25 @@ def run_claude(args: list[str], verbose: bool) -> int:
     # Parent process
     install_signal_handlers(child_pid)
 
+    # Parse sessions in the background while claude runs
+    project_dir = CLAUDE_DIR / encode_project_path(Path.cwd())
+    stop_prefetch = threading.Event()
+    prefetch = threading.Thread(
+        target=_prefetch_sessions,
+        args=(project_dir, start_time, stop_prefetch),
+        name=_PREFETCH_THREAD_NAME,
+        daemon=True,
+    )
+    log.addFilter(_hold_prefetch_records)
+    prefetch.start()
+
     try:
-        while True:
-            try:
-                _, status = os.waitpid(child_pid, 0)
-                break
-            except OSError as e:
-                if e.errno == errno.EINTR:
-                    continue
-                raise
-
-        if os.WIFEXITED(status):
-            exit_code = os.WEXITSTATUS(status)
-        elif os.WIFSIGNALED(status):
-            exit_code = 128 + os.WTERMSIG(status)
-        else:
-            exit_code = 1
+        exit_code = _wait_child(child_pid)
     finally:
+        stop_prefetch.set()
+        prefetch.join()
+        log.removeFilter(_hold_prefetch_records)
+        _replay_prefetch_records()
         # Reset signal handlers to avoid stale child_pid on subsequent calls
         global _child_pid
         _child_pid = 0
@@ -131,20 +322,17 @@ def run_sync(session_id: str | None, verbose: bool) -> int:
 
     sessions = discover_sessions(project_dir, start_time=0, session_id=session_id)
     output_dir = cwd / ".sessionbook"
-    seen = _existing_session_ids(output_dir)
-    count = 0
-
+    existing_names = _html_filenames(output_dir)
+    seen = _existing_session_ids(output_dir, existing_names)
+    pending: list[Session] = []
     for session in sessions:
         if session.session_id in seen:
             log.info("Skipping already-saved session %s", session.session_id)
             continue
-        try:
-            result = save_html(session, output_dir)
-            if result is not None:
-                seen.add(session.session_id)
-                count += 1
-        except Exception:
-            log.exception("Failed to save session %s", session.session_id)
+        seen.add(session.session_id)
+        pending.append(session)
+
+    count = len(_save_sessions(pending, output_dir, existing_names))
 
     log.info("Converted %d session(s)", count)
     return 0
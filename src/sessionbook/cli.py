@@ -5,13 +5,14 @@ import sys
 
 from sessionbook import __version__
 from sessionbook.capture import run_claude, run_sync
+from sessionbook.util import LOG_FORMAT
 
 log = logging.getLogger("sessionbook")
 
 
 def configure_logging(verbose: bool) -> None:
     handler = logging.StreamHandler()  # defaults to stderr
-    handler.setFormatter(logging.Formatter("[sessionbook] %(message)s"))
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
     log.addHandler(handler)
     log.setLevel(logging.DEBUG if verbose else logging.INFO)
 
@@ -1,11 +1,21 @@
 """HTML generation for sessionbook sessions."""
 
+import errno
+import functools
 import html
+import io
+import itertools
+import json
 import logging
+import operator
 import os
+import re
+import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import TextIO
 
 from markdown_it import MarkdownIt
 from pygments import highlight
@@ -18,16 +28,27 @@ from sessionbook.util import validate_agent_id as _validate_agent_id
 log = logging.getLogger("sessionbook")
 
 
+# Pygments formatters hold no per-call state, so one instance serves every block
+_FORMATTER = HtmlFormatter(nowrap=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_lexer(lang: str):
+    """Look up and cache the Pygments lexer for a fence language, or None."""
+    try:
+        return get_lexer_by_name(lang)
+    except ClassNotFound:
+        return None
+
+
 def highlight_code(code, lang, attrs):
     """Highlight code using Pygments."""
     if not lang:
         return None
-    try:
-        lexer = get_lexer_by_name(lang)
-        formatter = HtmlFormatter(nowrap=True)
-        return highlight(code, lexer, formatter)
-    except ClassNotFound:
+    lexer = _get_lexer(lang)
+    if lexer is None:
         return None
+    return highlight(code, lexer, _FORMATTER)
 
 
 # Initialize markdown renderer with GFM-like options
@@ -356,6 +377,68 @@ body {{
 }}
 """
 
+# Static document skeleton, built once at import. The <style> block is a plain
+# constant so build_html never copies the CSS through a format call.
+_HTML_HEAD_TEMPLATE = (
+    "<!DOCTYPE html>\n"
+    '<html lang="en">\n'
+    "<head>\n"
+    '    <meta charset="UTF-8">\n'
+    '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    '    <meta name="sessionbook-session-id" content="{session_id}">\n'
+    '    <meta name="sessionbook-converted" content="{conversion_time}">\n'
+    "    <title>Claude Code Session - {session_id}</title>"
+)
+
+_STYLE_BLOCK = "    <style>\n" + CSS_TEMPLATE + "\n    </style>"
+
+_HTML_HEADER_TEMPLATE = (
+    "</head>\n"
+    "<body>\n"
+    '    <div class="container">\n'
+    '        <header class="session-header">\n'
+    "            <h1>Claude Code Session</h1>\n"
+    '            <div class="session-meta">\n'
+    '                <span class="session-id">{session_id}</span>\n'
+    '                <span class="session-date">{session_date}</span>\n'
+    "            </div>\n"
+    "        </header>"
+)
+
+_HTML_TAIL = "    </div>\n</body>\n</html>"
+
+# Per-element skeletons, filled with a single str.format per element
+_TURN_TEMPLATE = (
+    '        <article class="turn turn-{role}" id="turn-{idx}">\n'
+    '            <div class="turn-meta">\n'
+    '                <span class="turn-role">{label}</span>\n'
+    '                <span class="turn-timestamp">{ts}</span>\n'
+    "            </div>\n"
+    '            <div class="turn-content">{content}</div>\n'
+)
+_THINKING_TEMPLATE = (
+    '            <details class="thinking-block">\n'
+    "                <summary>Thinking</summary>\n"
+    '                <div class="thinking-content">{content}</div>\n'
+    "            </details>"
+)
+_CHOICE_TEMPLATE = (
+    '            <div class="choice-card">\n'
+    '                <div class="choice-question">{question}</div>\n'
+    '                <ul class="choice-options">{options}\n'
+    "                </ul>\n"
+    "            </div>"
+)
+_CHOICE_OPTION_TEMPLATE = '\n                    <li class="choice-option">{}</li>'
+_CHOICE_SELECTED_TEMPLATE = (
+    '\n                    <li class="choice-option choice-selected">{}</li>'
+)
+
+
+# Text without any of these characters is returned as-is, skipping the five
+# str.replace passes in html.escape.
+_HTML_SPECIAL_RE = re.compile(r"[&<>\"']")
+
 
 def _escape_html(text: str) -> str:
     """Escape HTML special characters in text.
@@ -368,21 +451,56 @@ def _escape_html(text: str) -> str:
     """
     if not isinstance(text, str):
         text = str(text)
+    if _HTML_SPECIAL_RE.search(text) is None:
+        return text
     return html.escape(text, quote=True)
 
 
-def _render_markdown(text: str) -> str:
+# Characters and sequences that can make markdown-it output differ from a bare
+# <p> of the input: block/inline syntax, HTML escaping, linkify (., :, @) and
+# typographer replacements (quotes, dashes, ellipses, (c), +-, ,, and ????).
+_MD_SIGIL_RE = re.compile(r"[`*_#>\[\]<\\\n\r\x00|~\-&.()+\"':@…]|,,|[?!]{4}")
+
+
+def _render_markdown(text: str, cache: dict[str, str] | None = None) -> str:
     """Render markdown text to HTML.
 
     Args:
         text: Markdown string
+        cache: Optional per-document map of source text to rendered HTML, so
+            repeated snippets (boilerplate thinking, echoed code) parse once
 
     Returns:
         HTML string
     """
     if not isinstance(text, str):
         text = str(text)
-    return md.render(text)
+    # Plain single-line text renders to a bare paragraph; skip the parser
+    if text and text == text.strip() and not _MD_SIGIL_RE.search(text):
+        return f"<p>{text}</p>\n"
+    if cache is None:
+        return md.render(text)
+    rendered = cache.get(text)
+    if rendered is None:
+        rendered = cache[text] = md.render(text)
+    return rendered
+
+
+def _write_thinking_block(
+    thinking_block: ThinkingBlock, out: TextIO, cache: dict[str, str] | None = None
+) -> None:
+    """Write a thinking block as HTML details element.
+
+    Args:
+        thinking_block: ThinkingBlock object with text
+        out: Text stream to write to
+        cache: Optional markdown render cache (see _render_markdown)
+
+    The element is collapsed by default (no 'open' attribute).
+    """
+    out.write(
+        _THINKING_TEMPLATE.format(content=_render_markdown(thinking_block.text, cache))
+    )
 
 
 def _render_thinking_block(thinking_block: ThinkingBlock) -> str:
@@ -395,13 +513,29 @@ def _render_thinking_block(thinking_block: ThinkingBlock) -> str:
         HTML string for <details class="thinking-block">...</details>
         (collapsed by default, no 'open' attribute)
     """
-    content = _render_markdown(thinking_block.text)
-    return (
-        '            <details class="thinking-block">\n'
-        "                <summary>Thinking</summary>\n"
-        f'                <div class="thinking-content">{content}</div>\n'
-        "            </details>"
+    buf = io.StringIO()
+    _write_thinking_block(thinking_block, buf)
+    return buf.getvalue()
+
+
+def _write_user_choice(user_choice: UserChoice, out: TextIO) -> None:
+    """Write a user choice interaction as HTML card.
+
+    Args:
+        user_choice: UserChoice object with question, options, selected_index
+        out: Text stream to write to
+    """
+    question = _escape_html(user_choice.question)
+    options = "".join(
+        (
+            _CHOICE_SELECTED_TEMPLATE
+            if i == user_choice.selected_index
+            else _CHOICE_OPTION_TEMPLATE
+        ).format(_escape_html(option))
+        for i, option in enumerate(user_choice.options)
     )
+    out.write(_CHOICE_TEMPLATE.format(question=question, options=options))
+    log.debug("Rendered user choice: %s", question)
 
 
 def _render_user_choice(user_choice: UserChoice) -> str:
@@ -414,45 +548,17 @@ def _render_user_choice(user_choice: UserChoice) -> str:
         HTML string for <div class="choice-card">...</div>
         with question, options list, and selected option highlighted
     """
-    question = _escape_html(user_choice.question)
-    parts = [
-        '            <div class="choice-card">',
-        f'                <div class="choice-question">{question}</div>',
-        '                <ul class="choice-options">',
-    ]
-
-    for i, option in enumerate(user_choice.options):
-        escaped_option = _escape_html(option)
-        if i == user_choice.selected_index:
-            parts.append(
-                f'                    <li class="choice-option choice-selected">{escaped_option}</li>'
-            )
-        else:
-            parts.append(
-                f'                    <li class="choice-option">{escaped_option}</li>'
-            )
+    buf = io.StringIO()
+    _write_user_choice(user_choice, buf)
+    return buf.getvalue()
 
-    parts.extend(
-        [
-            "                </ul>",
-            "            </div>",
-        ]
-    )
 
-    log.debug("Rendered user choice: %s", question)
-    return "\n".join(parts)
-
-
-def _render_sub_agent_card(sub_agent_ref: SubAgentRef) -> str:
-    """Render a sub-agent reference as HTML card with link.
+def _write_sub_agent_card(sub_agent_ref: SubAgentRef, out: TextIO) -> None:
+    """Write a sub-agent reference as HTML card with link.
 
     Args:
         sub_agent_ref: SubAgentRef with agent_id, summary, transcript_path
-
-    Returns:
-        HTML string for <div class="sub-agent-card">...</div>
-        with summary and hyperlink if transcript_path is not None,
-        otherwise with broken-link indicator
+        out: Text stream to write to
     """
     agent_id = _escape_html(sub_agent_ref.agent_id)
     subagent_type = _escape_html(sub_agent_ref.subagent_type)
@@ -464,13 +570,13 @@ def _render_sub_agent_card(sub_agent_ref: SubAgentRef) -> str:
         summary_text = summary_text[:500] + "..."
     summary = _escape_html(summary_text)
 
-    parts = [
-        '            <div class="sub-agent-card">',
-        '                <div class="sub-agent-header">',
-        f'                    <span class="sub-agent-type">{subagent_type}</span>',
-        f"                    <span>{description}</span>",
-        "                </div>",
-    ]
+    out.write(
+        '            <div class="sub-agent-card">\n'
+        '                <div class="sub-agent-header">\n'
+        f'                    <span class="sub-agent-type">{subagent_type}</span>\n'
+        f"                    <span>{description}</span>\n"
+        "                </div>\n"
+    )
 
     # Add metadata if available
     meta_parts = []
@@ -482,80 +588,123 @@ def _render_sub_agent_card(sub_agent_ref: SubAgentRef) -> str:
 
     if meta_parts:
         meta_text = _escape_html(" • ".join(meta_parts))
-        parts.append(f'                <div class="sub-agent-meta">{meta_text}</div>')
+        out.write(f'                <div class="sub-agent-meta">{meta_text}</div>\n')
 
-    parts.append(f'                <div class="sub-agent-summary">{summary}</div>')
+    out.write(f'                <div class="sub-agent-summary">{summary}</div>\n')
 
     if sub_agent_ref.transcript_path:
         link = _escape_html(sub_agent_ref.transcript_path)
-        parts.append(
-            f'                <a href="{link}" class="sub-agent-link">View transcript →</a>'
+        out.write(
+            f'                <a href="{link}" class="sub-agent-link">View transcript →</a>\n'
         )
     else:
-        parts.append(
-            '                <span class="sub-agent-broken-link">Transcript not available</span>'
+        out.write(
+            '                <span class="sub-agent-broken-link">Transcript not available</span>\n'
         )
 
-    parts.append("            </div>")
-
+    out.write("            </div>")
     log.debug("Rendered sub-agent card: %s", agent_id)
-    return "\n".join(parts)
 
 
-def _render_turn_html(turn: Turn, turn_index: int) -> str:
-    """Render a single Turn as HTML article element.
+def _render_sub_agent_card(sub_agent_ref: SubAgentRef) -> str:
+    """Render a sub-agent reference as HTML card with link.
 
     Args:
-        turn: Turn object with role, text, timestamp, and optional metadata
-        turn_index: Zero-based index of turn in session (for element IDs)
+        sub_agent_ref: SubAgentRef with agent_id, summary, transcript_path
 
     Returns:
-        HTML string for <article class="turn turn-{role}">...</article>
+        HTML string for <div class="sub-agent-card">...</div>
+        with summary and hyperlink if transcript_path is not None,
+        otherwise with broken-link indicator
     """
-    role_class = f"turn-{turn.role}"
-    role_label = turn.role.capitalize()
-    timestamp = _escape_html(turn.timestamp)
-    content = _render_markdown(turn.text)
-
-    parts = [
-        f'        <article class="turn {role_class}" id="turn-{turn_index}">',
-        '            <div class="turn-meta">',
-        f'                <span class="turn-role">{role_label}</span>',
-        f'                <span class="turn-timestamp">{timestamp}</span>',
-        "            </div>",
-        f'            <div class="turn-content">{content}</div>',
-    ]
+    buf = io.StringIO()
+    _write_sub_agent_card(sub_agent_ref, buf)
+    return buf.getvalue()
+
+
+def _write_turn_html(
+    turn: Turn, turn_index: int, out: TextIO, cache: dict[str, str] | None = None
+) -> None:
+    """Write a single Turn as HTML article element.
+
+    Args:
+        turn: Turn object with role, text, timestamp, and optional metadata
+        turn_index: Zero-based index of turn in session (for element IDs)
+        out: Text stream to write to
+        cache: Optional markdown render cache (see _render_markdown)
+    """
+    out.write(
+        _TURN_TEMPLATE.format(
+            role=turn.role,
+            idx=turn_index,
+            label=turn.role.capitalize(),
+            ts=_escape_html(turn.timestamp),
+            content=_render_markdown(turn.text, cache),
+        )
+    )
 
     # Render thinking blocks
     for thinking_block in turn.thinking_blocks:
-        parts.append(_render_thinking_block(thinking_block))
+        _write_thinking_block(thinking_block, out, cache)
+        out.write("\n")
         log.debug("Rendered thinking block: %s...", thinking_block.text[:50])
 
     # Render user choice if present
     if turn.user_choice:
-        parts.append(_render_user_choice(turn.user_choice))
+        _write_user_choice(turn.user_choice, out)
+        out.write("\n")
 
     # Render sub-agent cards
     for sub_agent_ref in turn.sub_agent_refs:
         if _validate_agent_id(sub_agent_ref.agent_id):
-            parts.append(_render_sub_agent_card(sub_agent_ref))
+            _write_sub_agent_card(sub_agent_ref, out)
+            out.write("\n")
         else:
             log.warning(
                 "Skipping sub-agent card for invalid ID: %s", sub_agent_ref.agent_id
             )
 
-    parts.append("        </article>")
-    return "\n".join(parts)
+    out.write("        </article>")
 
 
-def build_html(session: Session) -> str:
-    """Generate complete HTML document from Session.
+def _render_turn_html(
+    turn: Turn, turn_index: int, cache: dict[str, str] | None = None
+) -> str:
+    """Render a single Turn as HTML article element.
 
     Args:
-        session: Session object with turns and metadata
+        turn: Turn object with role, text, timestamp, and optional metadata
+        turn_index: Zero-based index of turn in session (for element IDs)
+        cache: Optional markdown render cache (see _render_markdown)
 
     Returns:
-        Complete HTML5 document as string with inline CSS
+        HTML string for <article class="turn turn-{role}">...</article>
+    """
+    buf = io.StringIO()
+    _write_turn_html(turn, turn_index, buf, cache)
+    return buf.getvalue()
+
+
+# Sessions longer than this render their turns on a thread pool, but only on
+# free-threaded builds: with the GIL the pure-Python markdown/Pygments work
+# would just serialize, and sessions are already spread across processes.
+_PARALLEL_TURN_THRESHOLD = 200
+
+
+def _gil_enabled() -> bool:
+    """Return False on free-threaded Python builds running without the GIL."""
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def write_html(session: Session, out: TextIO) -> None:
+    """Write complete HTML document for a Session to a text stream.
+
+    The document is written incrementally, one turn at a time, so peak memory
+    does not grow with the size of the output.
+
+    Args:
+        session: Session object with turns and metadata
+        out: Text stream to write to
 
     Notes:
         - All user-provided text is HTML-escaped
@@ -576,45 +725,55 @@ def build_html(session: Session) -> str:
         except (ValueError, AttributeError):
             pass
 
-    # Build HTML header
-    html_parts = [
-        "<!DOCTYPE html>",
-        '<html lang="en">',
-        "<head>",
-        '    <meta charset="UTF-8">',
-        '    <meta name="viewport" content="width=device-width, initial-scale=1.0">',
-        f'    <meta name="sessionbook-session-id" content="{session_id}">',
-        f'    <meta name="sessionbook-converted" content="{conversion_time}">',
-        f"    <title>Claude Code Session - {session_id}</title>",
-        "    <style>",
-        CSS_TEMPLATE,
-        "    </style>",
-        "</head>",
-        "<body>",
-        '    <div class="container">',
-        '        <header class="session-header">',
-        "            <h1>Claude Code Session</h1>",
-        '            <div class="session-meta">',
-        f'                <span class="session-id">{session_id}</span>',
-        f'                <span class="session-date">{_escape_html(session_date)}</span>',
-        "            </div>",
-        "        </header>",
-    ]
-
-    # Render turns
-    for i, turn in enumerate(session.turns):
-        html_parts.append(_render_turn_html(turn, i))
-
-    # Close HTML
-    html_parts.extend(
-        [
-            "    </div>",
-            "</body>",
-            "</html>",
-        ]
+    # Write HTML header
+    out.write(
+        _HTML_HEAD_TEMPLATE.format(
+            session_id=session_id, conversion_time=conversion_time
+        )
+    )
+    out.write("\n")
+    out.write(_STYLE_BLOCK)
+    out.write("\n")
+    out.write(
+        _HTML_HEADER_TEMPLATE.format(
+            session_id=session_id, session_date=_escape_html(session_date)
+        )
     )
 
-    return "\n".join(html_parts)
+    # Render turns, parsing each distinct markdown source once per document
+    cache: dict[str, str] = {}
+    if len(session.turns) > _PARALLEL_TURN_THRESHOLD and not _gil_enabled():
+        workers = min(4, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for rendered in executor.map(
+                _render_turn_html,
+                session.turns,
+                range(len(session.turns)),
+                itertools.repeat(cache),
+            ):
+                out.write("\n")
+                out.write(rendered)
+    else:
+        for i, turn in enumerate(session.turns):
+            out.write("\n")
+            _write_turn_html(turn, i, out, cache)
+
+    out.write("\n")
+    out.write(_HTML_TAIL)
+
+
+def build_html(session: Session) -> str:
+    """Generate complete HTML document from Session.
+
+    Args:
+        session: Session object with turns and metadata
+
+    Returns:
+        Complete HTML5 document as string with inline CSS (see write_html)
+    """
+    out = io.StringIO()
+    write_html(session, out)
+    return out.getvalue()
 
 
 def _compute_filename(session: Session) -> str:
@@ -643,57 +802,260 @@ def _compute_filename(session: Session) -> str:
     return dt_local.strftime("%Y-%m-%dT%H-%M-%S") + ".html"
 
 
-def _existing_session_ids(output_dir: Path) -> set[str]:
-    """Scan .sessionbook/*.html files and extract session IDs from meta tags.
+# Matches the session ID meta tag written by build_html
+_SESSION_ID_META_RE = re.compile(
+    rb'name="sessionbook-session-id"[^>]*content="([^"]+)"'
+)
+_META_SCAN_BYTES = 8192
+
+
+# Sidecar index of saved sessions, one {"id", "file", "mtime_ns", "size"} object
+# per line; mtime_ns and size describe the HTML file as it was indexed
+INDEX_FILENAME = ".index.jsonl"
+
+
+def _read_session_id(html_file: Path) -> str | None:
+    """Extract the session ID meta tag from the head of a saved HTML file.
+
+    Args:
+        html_file: Path to a sessionbook HTML file
+
+    Returns:
+        Session ID, or None if the file is unreadable or has no meta tag
+    """
+    try:
+        fd = os.open(html_file, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        # The meta tag lives in <head>, so one read of the first block suffices
+        head = os.read(fd, _META_SCAN_BYTES)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    match = _SESSION_ID_META_RE.search(head)
+    if match:
+        return match.group(1).decode("utf-8", "replace")
+    return None
+
+
+def _load_index(output_dir: Path) -> dict[str, tuple[str, int, int]]:
+    """Load the session index sidecar from output_dir.
+
+    Args:
+        output_dir: Directory containing HTML files and the index
+
+    Returns:
+        Mapping of HTML filename to (session ID, mtime_ns, size) as indexed;
+        empty if no index exists. Malformed lines and entries without an
+        mtime or size are skipped; later entries win.
+    """
+    index: dict[str, tuple[str, int, int]] = {}
+    try:
+        with open(output_dir / INDEX_FILENAME, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    index[entry["file"]] = (
+                        entry["id"],
+                        int(entry["mtime_ns"]),
+                        int(entry["size"]),
+                    )
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return index
+
+
+def _append_index(
+    output_dir: Path, session_id: str, filename: str, mtime_ns: int, size: int
+) -> None:
+    """Append a session entry to the index sidecar.
+
+    Each entry is a single line written with one append, so concurrent
+    writers never need a read-modify-write cycle.
+
+    Args:
+        output_dir: Directory containing HTML files and the index
+        session_id: Session ID that was saved
+        filename: Name of the HTML file within output_dir
+        mtime_ns: Modification time of the HTML file as it was indexed
+        size: Size of the HTML file as it was indexed
+    """
+    entry = {"id": session_id, "file": filename, "mtime_ns": mtime_ns, "size": size}
+    line = json.dumps(entry) + "\n"
+    try:
+        with open(output_dir / INDEX_FILENAME, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        log.warning("Cannot update session index: %s", e)
+
+
+def _html_filenames(output_dir: Path) -> set[str]:
+    """List the names of HTML files in output_dir with a single directory walk.
 
     Args:
         output_dir: Directory containing HTML files
 
+    Returns:
+        Set of *.html file names (empty if the directory is missing or unreadable)
+    """
+    try:
+        with os.scandir(output_dir) as it:
+            return {entry.name for entry in it if entry.name.endswith(".html")}
+    except OSError:
+        return set()
+
+
+def _existing_session_ids(
+    output_dir: Path, html_names: set[str] | None = None
+) -> set[str]:
+    """Return IDs of sessions already saved in output_dir.
+
+    Uses the index sidecar for files it knows about and only scans the meta
+    tags of HTML files missing from it (e.g. saved before the index existed)
+    or modified since they were indexed. Scanned files are added to the index
+    so the next run skips them.
+
+    Args:
+        output_dir: Directory containing HTML files
+        html_names: Result of _html_filenames(output_dir) if the caller has
+            already listed the directory
+
     Returns:
         Set of session IDs that have been saved
     """
     ids: set[str] = set()
-    if not output_dir.is_dir():
+    if html_names is None:
+        html_names = _html_filenames(output_dir)
+    if not html_names:
         return ids
 
-    for html_file in output_dir.glob("*.html"):
+    index = _load_index(output_dir)
+    for name in html_names:
+        html_file = output_dir / name
         try:
-            with open(html_file, encoding="utf-8") as f:
-                # Read first 50 lines to find meta tag (it's in <head>)
-                for _ in range(50):
-                    line = f.readline()
-                    if not line:
-                        break
-                    # Look for sessionbook-session-id meta tag
-                    if 'name="sessionbook-session-id"' in line and 'content="' in line:
-                        # Extract content value
-                        start = line.find('content="') + len('content="')
-                        end = line.find('"', start)
-                        if start > 0 and end > start:
-                            session_id = line[start:end]
-                            ids.add(session_id)
-                            break
+            st = os.stat(html_file)
         except OSError:
-            # Skip files that can't be read
-            pass
+            continue
+        # Trust the index only while the file is unchanged since it was
+        # indexed; a restored copy can carry an older mtime, so no ordering
+        entry = index.get(name)
+        if entry is not None and entry[1:] == (st.st_mtime_ns, st.st_size):
+            ids.add(entry[0])
+            continue
+        found_id = _read_session_id(html_file)
+        if found_id is not None:
+            ids.add(found_id)
+            _append_index(output_dir, found_id, name, st.st_mtime_ns, st.st_size)
 
     return ids
 
 
-def save_html(session: Session, output_dir: Path) -> Path | None:
+# errnos from os.link meaning the filesystem has no hard links
+_NO_HARDLINK_ERRNOS = frozenset(
+    {errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EMLINK, errno.ENOSYS}
+)
+
+
+def _publish_html(
+    tmp_path: str,
+    output_dir: Path,
+    filename: str,
+    existing_names: set[str] | None,
+) -> Path | None:
+    """Move a finished tempfile to the first free name based on filename.
+
+    The tempfile is hard-linked to the candidate name, which claims the name
+    and publishes the complete file in one atomic step, so concurrent savers
+    never pick the same file. On filesystems without hard links the name is
+    reserved with an O_EXCL placeholder and the tempfile renamed over it.
+
+    Args:
+        tmp_path: Completed tempfile in output_dir
+        output_dir: Directory the file is published in
+        filename: Preferred name; "-N" suffixes are tried on collision
+        existing_names: Names known to be taken, skipped without touching the
+            filesystem; the chosen name is added
+
+    Returns:
+        Path to the published file, or None after 1000 collisions
+
+    Raises:
+        OSError: If the file cannot be published
+    """
+    final_path = output_dir / filename
+    stem = final_path.stem
+    use_link = True
+    suffix_num = 0
+    while suffix_num <= 1000:
+        if suffix_num:
+            final_path = output_dir / f"{stem}-{suffix_num}.html"
+        if existing_names is None or final_path.name not in existing_names:
+            try:
+                if use_link:
+                    os.link(tmp_path, final_path)
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                else:
+                    os.close(
+                        os.open(final_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                    )
+                    try:
+                        os.rename(tmp_path, final_path)
+                    except BaseException:
+                        final_path.unlink(missing_ok=True)
+                        raise
+            except FileExistsError:
+                pass
+            except OSError as e:
+                if not use_link or e.errno not in _NO_HARDLINK_ERRNOS:
+                    raise
+                # Retry this name with a placeholder reservation
+                use_link = False
+                continue
+            else:
+                if suffix_num:
+                    log.debug(
+                        "Filename collision resolved: %s → %s",
+                        filename,
+                        final_path.name,
+                    )
+                if existing_names is not None:
+                    existing_names.add(final_path.name)
+                return final_path
+        suffix_num += 1
+    return None
+
+
+_turn_counts_getter = operator.attrgetter("thinking_blocks", "sub_agent_refs")
+
+
+def save_html(
+    session: Session, output_dir: Path, existing_names: set[str] | None = None
+) -> Path | None:
     """Convert a Session to HTML and write atomically.
 
     Args:
         session: Session object with turns and metadata
         output_dir: Directory to write HTML file (typically .sessionbook/)
+        existing_names: File names already known to be taken in output_dir.
+            Known names are skipped without touching the filesystem, and the
+            chosen name is added to the set.
 
     Returns:
         Path to written HTML file, or None if session is empty
 
     Side effects:
         - Creates output_dir if not exists (mode 0o755)
-        - Writes HTML file atomically (tempfile + rename)
+        - Writes HTML file atomically (tempfile + fsync, then hard link to
+          the final name)
         - Sets file permissions to 0o644
+        - Appends the session to the index sidecar (.index.jsonl)
         - Logs info message with filename, turn count, thinking block count
 
     Error handling:
@@ -712,45 +1074,46 @@ def save_html(session: Session, output_dir: Path) -> Path | None:
         log.error("Cannot create %s: %s", output_dir, e)
         return None
 
-    # Generate HTML
-    html_content = build_html(session)
-
-    # Compute filename with collision handling
+    # Render into a tempfile first; the final name is only claimed once the
+    # document is complete, so an interrupted save never leaves an empty or
+    # truncated .html behind
     filename = _compute_filename(session)
-    final_path = output_dir / filename
-
-    if final_path.exists():
-        stem = final_path.stem
-        suffix_num = 1
-        while final_path.exists():
-            final_path = output_dir / f"{stem}-{suffix_num}.html"
-            suffix_num += 1
-            if suffix_num > 1000:
-                log.error("Too many filename collisions for %s", filename)
-                return None
-        log.debug("Filename collision resolved: %s → %s", filename, final_path.name)
-
-    # Atomic write
     try:
         fd, tmp_path = tempfile.mkstemp(dir=str(output_dir), suffix=".html.tmp")
+        final_path = None
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(html_content)
-            os.chmod(tmp_path, 0o644)
-            os.rename(tmp_path, str(final_path))
-        except BaseException:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-            raise
+            # Render straight into the tempfile rather than building the
+            # whole document in memory first
+            with os.fdopen(fd, "w", encoding="utf-8", buffering=1 << 20) as f:
+                write_html(session, f)
+                f.flush()
+                os.fchmod(fd, 0o644)
+                os.fsync(fd)
+                st = os.fstat(fd)
+            final_path = _publish_html(tmp_path, output_dir, filename, existing_names)
+        finally:
+            # The rendered document only survives under its final name
+            if final_path is None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
     except OSError as e:
         log.error("Failed to write HTML: %s", e)
         return None
+    if final_path is None:
+        log.error("Too many filename collisions for %s", filename)
+        return None
+
+    _append_index(
+        output_dir, session.session_id, final_path.name, st.st_mtime_ns, st.st_size
+    )
 
     # Count metadata for logging
-    thinking_count = sum(len(t.thinking_blocks) for t in session.turns)
-    sub_agent_count = sum(len(t.sub_agent_refs) for t in session.turns)
+    thinking_count = sub_agent_count = 0
+    for thinking_blocks, sub_agent_refs in map(_turn_counts_getter, session.turns):
+        thinking_count += len(thinking_blocks)
+        sub_agent_count += len(sub_agent_refs)
     log.info(
         "Saved %s (%d turns, %d thinking blocks, %d sub-agents)",
         final_path.name,
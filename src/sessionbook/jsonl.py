@@ -1,16 +1,35 @@
+import functools
 import json
 import logging
+import os
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
-from sessionbook.util import validate_agent_id
+from sessionbook.util import init_worker_logging, validate_agent_id
+
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup, see the "fast" extra
+    _json_loads = json.loads
 
 log = logging.getLogger("sessionbook")
 
 CLAUDE_DIR = Path.home() / ".claude" / "projects"
 
+# Parsed sessions by file, reused while the file's (mtime_ns, size) is
+# unchanged; least recently used entries are evicted beyond the size cap
+_PARSE_CACHE_SIZE = 256
+_parse_cache: OrderedDict[Path, tuple[int, int, "Session | None"]] = OrderedDict()
 
-@dataclass
+
+@dataclass(slots=True)
 class ThinkingBlock:
     """A thinking block from an assistant message content array.
 
@@ -20,7 +39,7 @@ class ThinkingBlock:
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class UserChoice:
     """A user choice interaction from AskUserQuestion tool.
 
@@ -33,7 +52,7 @@ class UserChoice:
     selected_index: int
 
 
-@dataclass
+@dataclass(slots=True)
 class SubAgentRef:
     """A reference to a sub-agent transcript spawned via Task tool.
 
@@ -49,7 +68,7 @@ class SubAgentRef:
     transcript_path: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Turn:
     """A single user message or assistant response in the conversation.
 
@@ -64,7 +83,7 @@ class Turn:
     sub_agent_refs: list[SubAgentRef] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     session_id: str
     turns: list[Turn]
@@ -82,239 +101,360 @@ def encode_project_path(cwd: Path) -> str:
 
 def _extract_text(content) -> str:
     """Extract text from message content (string or content block array)."""
-    if isinstance(content, str):
+    # Decoded JSON holds exact str/list/dict, so identity checks suffice
+    if type(content) is str:
         return content
-    if isinstance(content, list):
+    if type(content) is list:
         parts = []
         for block in content:
-            if isinstance(block, dict) and block.get("type") == "text":
+            if type(block) is dict and block.get("type") == "text":
                 parts.append(block.get("text", ""))
-        return "\n".join(parts) if parts else ""
+        return "\n".join(parts)
     return ""
 
 
-def parse_session(filepath: Path) -> Session | None:
-    """Parse a single JSONL file into a Session."""
-    entries = []
-    session_id = None
-    progress_entries_by_parent: dict[str, list[dict]] = {}
-
-    try:
-        with open(filepath) as f:
-            for lineno, raw_line in enumerate(f, 1):
-                raw_line = raw_line.strip()
-                if not raw_line:
-                    continue
+# Kinds of tool_use tracked in pending_tool_uses until their tool_result
+_KIND_TASK = 0
+_KIND_ASK = 1
+
+# Assistant content-block handlers, dispatched by block "type". Each takes
+# (block, text_parts, thinking_blocks, pending_tool_uses) and appends to
+# whichever accumulator applies.
+
+
+def _handle_text_block(
+    block: dict,
+    text_parts: list[str],
+    thinking_blocks: list[ThinkingBlock],
+    pending_tool_uses: dict[str, tuple[int, dict]],
+) -> None:
+    text_parts.append(block.get("text", ""))
+
+
+def _handle_thinking_block(
+    block: dict,
+    text_parts: list[str],
+    thinking_blocks: list[ThinkingBlock],
+    pending_tool_uses: dict[str, tuple[int, dict]],
+) -> None:
+    # Extract thinking blocks (TASK-002)
+    thinking_text = block.get("thinking", "")
+    if thinking_text:
+        thinking_blocks.append(ThinkingBlock(text=thinking_text))
+        log.debug("Extracted thinking block (%d chars)", len(thinking_text))
+
+
+def _handle_tool_use_block(
+    block: dict,
+    text_parts: list[str],
+    thinking_blocks: list[ThinkingBlock],
+    pending_tool_uses: dict[str, tuple[int, dict]],
+) -> None:
+    tool_name = block.get("name")
+    tool_use_id = block.get("id", "")
+
+    # Track Task tool_use blocks (TASK-003)
+    if tool_name == "Task" and tool_use_id:
+        inp = block.get("input", {})
+        pending_tool_uses[tool_use_id] = (
+            _KIND_TASK,
+            {
+                "subagent_type": inp.get("subagent_type", ""),
+                "description": inp.get("description", ""),
+            },
+        )
+
+    # Track AskUserQuestion tool_use blocks (TASK-005 - placeholder)
+    elif tool_name == "AskUserQuestion" and tool_use_id:
+        inp = block.get("input", {})
+        pending_tool_uses[tool_use_id] = (
+            _KIND_ASK,
+            {"questions": inp.get("questions", [])},
+        )
+
+
+_BLOCK_HANDLERS: dict[str, Callable[..., None]] = {
+    "text": _handle_text_block,
+    "thinking": _handle_thinking_block,
+    "tool_use": _handle_tool_use_block,
+}
+
+
+# User content blocks that mark a message as internal rather than a turn
+_SKIP_BLOCK_TYPES = frozenset({"tool_result", "file_history_snapshot"})
+
+# Entry types that can form turns; a set, since decoded strings are never
+# identical to the literals and a tuple would compare each in turn
+_TURN_TYPES = frozenset({"user", "assistant"})
+
+# User messages starting with these are CLI metadata/output, not turns
+_COMMAND_PREFIXES = ("<command-", "<local-command-")
+
+# Every entry _iter_entries keeps carries one of these JSON strings, so a
+# complete-looking object containing none of them can be dropped without
+# decoding it. The check is positive only: isMeta/isSidechain bytes may also
+# occur inside nested data.
+_CANDIDATE_MARKERS = (b'"user"', b'"assistant"', b'"progress"')
+
+_READ_BUFFER_SIZE = 1 << 20
+_SLURP_LIMIT = 64 << 20
+
+
+def _iter_entries(
+    filepath: Path, progress_entries_by_parent: dict[str, list[dict]]
+) -> Iterator[dict]:
+    """Stream the user/assistant entries of a JSONL file that form turns.
+
+    Malformed lines, meta and sidechain entries are skipped. Complete objects
+    that cannot hold a user, assistant or progress entry are dropped before
+    decoding; truncated ones are still decoded so they are reported as
+    malformed. agent_progress entries are collected into
+    progress_entries_by_parent as a side effect.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(filepath, "rb", buffering=_READ_BUFFER_SIZE) as f:
+        # Typical session files are read whole and split in C; only very large
+        # ones are streamed line by line to bound memory
+        lines: Iterable[bytes] = f
+        if os.fstat(f.fileno()).st_size < _SLURP_LIMIT:
+            lines = f.read().split(b"\n")
+        for lineno, raw_line in enumerate(lines, 1):
+            line = raw_line.strip()
+            if not line:
+                continue
+            # Only JSON objects are entries; anything else is malformed
+            if line[:1] != b"{":
+                log.warning("Skipping malformed line %d in %s", lineno, filepath.name)
+                continue
+            # Only lines shaped like a whole object skip decoding, so one cut
+            # short by a crash (no closing brace) still gets its warning
+            if (
+                line[-1:] == b"}"
+                and line[:2] == b'{"'
+                and not (
+                    _CANDIDATE_MARKERS[0] in line
+                    or _CANDIDATE_MARKERS[1] in line
+                    or _CANDIDATE_MARKERS[2] in line
+                )
+            ):
+                continue
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                # orjson is stricter than json (e.g. NaN, huge ints)
                 try:
-                    entry = json.loads(raw_line)
-                except json.JSONDecodeError:
+                    entry = json.loads(line)
+                except ValueError:
                     log.warning(
                         "Skipping malformed line %d in %s", lineno, filepath.name
                     )
                     continue
 
-                entry_type = entry.get("type")
-
-                # Collect progress entries for sub-agent transcript reconstruction (TASK-004)
-                if entry_type == "progress":
-                    data = entry.get("data", {})
-                    if data.get("type") == "agent_progress":
-                        parent_tool_use_id = entry.get("parentToolUseID", "")
-                        if parent_tool_use_id:
-                            if parent_tool_use_id not in progress_entries_by_parent:
-                                progress_entries_by_parent[parent_tool_use_id] = []
-                            progress_entries_by_parent[parent_tool_use_id].append(entry)
-                    continue
+            eget = entry.get
+            entry_type = eget("type")
 
-                if entry_type not in ("user", "assistant"):
-                    continue
-                if entry.get("isMeta"):
-                    continue
-                if entry.get("isSidechain"):
-                    continue
+            # Collect progress entries for sub-agent transcript reconstruction (TASK-004)
+            if entry_type == "progress":
+                data = eget("data", {})
+                if data.get("type") == "agent_progress":
+                    parent_tool_use_id = eget("parentToolUseID", "")
+                    if parent_tool_use_id:
+                        progress_entries_by_parent[parent_tool_use_id].append(entry)
+                continue
 
-                if session_id is None:
-                    session_id = entry.get("sessionId", filepath.stem)
+            # Non-string types (lists, objects) are unhashable and never turns
+            if type(entry_type) is not str or entry_type not in _TURN_TYPES:
+                continue
+            if eget("isMeta"):
+                continue
+            if eget("isSidechain"):
+                continue
 
-                entries.append(entry)
-    except OSError as e:
-        log.warning("Cannot read %s: %s", filepath, e)
-        return None
+            yield entry
 
-    if not entries:
-        return None
+
+def parse_session(filepath: Path) -> Session | None:
+    """Parse a single JSONL file into a Session.
+
+    Entries are turned into turns as they are read, in a single pass over the
+    file, without materializing the entry list.
+    """
+    session_id = None
+    progress_entries_by_parent: defaultdict[str, list[dict]] = defaultdict(list)
 
     # Build turns, combining consecutive assistant messages into single turns
     turns: list[Turn] = []
+    add_turn = turns.append  # bound once for the hot loop
     pending_assistant_texts: list[str] = []
     pending_thinking_blocks: list[ThinkingBlock] = []
     pending_sub_agent_refs: list[SubAgentRef] = []
     last_assistant_timestamp: str = ""
 
     # Track pending tool_use blocks to correlate with tool_result (TASK-003, TASK-005)
-    pending_task_tool_uses: dict[str, dict] = {}
-    pending_ask_tool_uses: dict[str, dict] = {}
-
-    for entry in entries:
-        msg = entry.get("message") or {}
-        if not isinstance(msg, dict):
-            msg = {}
-        role = msg.get("role", entry.get("type"))
-        content = msg.get("content", "")
-        timestamp = entry.get("timestamp", "")
-
-        if role == "user":
-            # Extract SubAgentRef from Task tool_result BEFORE skip checks (TASK-003)
-            if isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "tool_result":
-                        tool_use_id = block.get("tool_use_id", "")
-
-                        # Check for Task tool_result
-                        if tool_use_id in pending_task_tool_uses:
-                            task_info = pending_task_tool_uses.pop(tool_use_id)
-                            tool_result_meta = entry.get("toolUseResult", {})
-                            agent_id = tool_result_meta.get("agentId", "")
-
-                            if agent_id and validate_agent_id(agent_id):
-                                summary_parts = []
-                                result_content = block.get("content", [])
-                                if isinstance(result_content, list):
-                                    for part in result_content:
-                                        if (
-                                            isinstance(part, dict)
-                                            and part.get("type") == "text"
-                                        ):
-                                            text = part.get("text", "")
-                                            if not text.startswith("agentId:"):
-                                                summary_parts.append(text)
-                                summary = "\n".join(summary_parts)
-
-                                sub_agent_ref = SubAgentRef(
-                                    agent_id=agent_id,
-                                    subagent_type=task_info["subagent_type"],
-                                    description=task_info["description"],
-                                    summary=summary,
-                                    duration_ms=tool_result_meta.get("totalDurationMs"),
-                                    tool_use_count=tool_result_meta.get(
-                                        "totalToolUseCount"
-                                    ),
-                                    transcript_path=None,
-                                )
-                                # Attach to pending (will be flushed with next real assistant turn)
-                                pending_sub_agent_refs.append(sub_agent_ref)
-
-                        # Check for AskUserQuestion tool_result (TASK-005 - placeholder)
-                        if tool_use_id in pending_ask_tool_uses:
-                            pending_ask_tool_uses.pop(tool_use_id)
-                            log.debug(
-                                "AskUserQuestion tool_result found but parsing not implemented"
-                            )
+    pending_tool_uses: dict[str, tuple[int, dict]] = {}
 
-            # Skip tool results and other internal messages (don't add them as turns)
-            if isinstance(content, list):
-                has_tool_result_only = all(
-                    isinstance(block, dict)
-                    and block.get("type") in ("tool_result", "file_history_snapshot")
-                    for block in content
-                )
-                if has_tool_result_only:
-                    continue
+    try:
+        for entry in _iter_entries(filepath, progress_entries_by_parent):
+            # Bind the lookups once per entry; they run millions of times
+            eget = entry.get
+            if session_id is None:
+                session_id = eget("sessionId", filepath.stem)
+
+            msg = eget("message") or {}
+            if not isinstance(msg, dict):
+                msg = {}
+            mget = msg.get
+            role = mget("role", eget("type"))
+            content = mget("content", "")
+            timestamp = eget("timestamp", "")
+
+            if role == "user":
+                # Extract SubAgentRef from Task tool_result BEFORE skip checks (TASK-003)
+                # The same scan classifies the message: one made up only of
+                # tool results/snapshots is internal and not a turn
+                has_tool_result_only = True
+                if isinstance(content, list):
+                    for block in content:
+                        if not isinstance(block, dict):
+                            has_tool_result_only = False
+                            continue
+                        bget = block.get
+                        block_type = bget("type")
+                        # Non-string types are unhashable and never skip markers
+                        if (
+                            type(block_type) is not str
+                            or block_type not in _SKIP_BLOCK_TYPES
+                        ):
+                            has_tool_result_only = False
+                        elif block_type == "tool_result":
+                            tool_use_id = bget("tool_use_id", "")
+                            pending = pending_tool_uses.pop(tool_use_id, None)
+                            if pending is None:
+                                continue
+                            kind, task_info = pending
+
+                            # Check for Task tool_result
+                            if kind == _KIND_TASK:
+                                tool_result_meta = eget("toolUseResult", {})
+                                agent_id = tool_result_meta.get("agentId", "")
+
+                                if agent_id and validate_agent_id(agent_id):
+                                    summary_parts = []
+                                    result_content = bget("content", [])
+                                    if isinstance(result_content, list):
+                                        for part in result_content:
+                                            if (
+                                                isinstance(part, dict)
+                                                and part.get("type") == "text"
+                                            ):
+                                                text = part.get("text", "")
+                                                if not text.startswith("agentId:"):
+                                                    summary_parts.append(text)
+                                    summary = "\n".join(summary_parts)
+
+                                    sub_agent_ref = SubAgentRef(
+                                        agent_id=agent_id,
+                                        subagent_type=task_info["subagent_type"],
+                                        description=task_info["description"],
+                                        summary=summary,
+                                        duration_ms=tool_result_meta.get(
+                                            "totalDurationMs"
+                                        ),
+                                        tool_use_count=tool_result_meta.get(
+                                            "totalToolUseCount"
+                                        ),
+                                        transcript_path=None,
+                                    )
+                                    # Attach to pending (will be flushed with next real assistant turn)
+                                    pending_sub_agent_refs.append(sub_agent_ref)
+
+                            # Check for AskUserQuestion tool_result (TASK-005 - placeholder)
+                            elif kind == _KIND_ASK:
+                                log.debug(
+                                    "AskUserQuestion tool_result found but parsing not implemented"
+                                )
 
-            # Skip command metadata and CLI output (e.g., /exit, <local-command-stdout>)
-            if isinstance(content, str):
-                stripped = content.strip()
-                if stripped.startswith("<command-") or stripped.startswith(
-                    "<local-command-"
-                ):
+                # Skip tool results and other internal messages (don't add them as turns)
+                if isinstance(content, list) and has_tool_result_only:
                     continue
 
-            # This is a real user message — flush pending assistant data first
-            if pending_assistant_texts:
-                combined = "".join(pending_assistant_texts)
-                if combined.strip():
-                    turns.append(
-                        Turn(
-                            role="assistant",
-                            text=combined,
-                            timestamp=last_assistant_timestamp,
-                            thinking_blocks=pending_thinking_blocks.copy(),
-                            sub_agent_refs=pending_sub_agent_refs.copy(),
+                # Skip command metadata and CLI output (e.g., /exit, <local-command-stdout>)
+                if isinstance(content, str):
+                    stripped = content.strip()
+                    if stripped[:1] == "<" and stripped.startswith(_COMMAND_PREFIXES):
+                        continue
+
+                # This is a real user message — flush pending assistant data first
+                if pending_assistant_texts:
+                    combined = "".join(pending_assistant_texts)
+                    if combined.strip():
+                        add_turn(
+                            Turn(
+                                role="assistant",
+                                text=combined,
+                                timestamp=last_assistant_timestamp,
+                                thinking_blocks=pending_thinking_blocks,
+                                sub_agent_refs=pending_sub_agent_refs,
+                            )
                         )
-                    )
-                pending_assistant_texts = []
-                pending_thinking_blocks = []
-                pending_sub_agent_refs = []
-                last_assistant_timestamp = ""
-
-            if isinstance(content, str) and content.strip():
-                turns.append(Turn(role="user", text=content, timestamp=timestamp))
-            elif isinstance(content, list):
-                text = _extract_text(content)
-                if text.strip():
-                    turns.append(Turn(role="user", text=text, timestamp=timestamp))
-
-        elif role == "assistant":
-            # Extract text and thinking blocks from content (TASK-002)
-            text_parts = []
-            thinking_blocks = []
-
-            if isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict):
+                    pending_assistant_texts = []
+                    pending_thinking_blocks = []
+                    pending_sub_agent_refs = []
+                    last_assistant_timestamp = ""
+
+                if isinstance(content, str) and content.strip():
+                    add_turn(Turn(role="user", text=content, timestamp=timestamp))
+                elif isinstance(content, list):
+                    text = _extract_text(content)
+                    if text.strip():
+                        add_turn(Turn(role="user", text=text, timestamp=timestamp))
+
+            elif role == "assistant":
+                # Extract text and thinking blocks from content (TASK-002)
+                text_parts: list[str] = []
+                thinking_blocks: list[ThinkingBlock] = []
+
+                if isinstance(content, list):
+                    for block in content:
+                        # JSON decoding only ever produces exact dicts
+                        if type(block) is not dict:
+                            continue
                         block_type = block.get("type")
-
-                        if block_type == "text":
-                            text_parts.append(block.get("text", ""))
-
-                        elif block_type == "thinking":
-                            thinking_text = block.get("thinking", "")
-                            if thinking_text:
-                                thinking_blocks.append(
-                                    ThinkingBlock(text=thinking_text)
-                                )
-                                log.debug(
-                                    "Extracted thinking block (%d chars)",
-                                    len(thinking_text),
+                        # Non-string types are unhashable and have no handler
+                        if type(block_type) is str:
+                            handler = _BLOCK_HANDLERS.get(block_type)
+                            if handler is not None:
+                                handler(
+                                    block,
+                                    text_parts,
+                                    thinking_blocks,
+                                    pending_tool_uses,
                                 )
 
-                        # Track Task tool_use blocks (TASK-003)
-                        elif block_type == "tool_use":
-                            tool_name = block.get("name")
-                            tool_use_id = block.get("id", "")
-
-                            if tool_name == "Task" and tool_use_id:
-                                inp = block.get("input", {})
-                                pending_task_tool_uses[tool_use_id] = {
-                                    "subagent_type": inp.get("subagent_type", ""),
-                                    "description": inp.get("description", ""),
-                                }
-
-                            # Track AskUserQuestion tool_use blocks (TASK-005 - placeholder)
-                            elif tool_name == "AskUserQuestion" and tool_use_id:
-                                inp = block.get("input", {})
-                                pending_ask_tool_uses[tool_use_id] = {
-                                    "questions": inp.get("questions", []),
-                                }
-
-            text = "\n".join(text_parts) if text_parts else ""
-            if text:
-                pending_assistant_texts.append(text)
-                pending_thinking_blocks.extend(thinking_blocks)
-                if not last_assistant_timestamp:
-                    last_assistant_timestamp = timestamp
+                text = "\n".join(text_parts) if text_parts else ""
+                if text:
+                    pending_assistant_texts.append(text)
+                    pending_thinking_blocks.extend(thinking_blocks)
+                    if not last_assistant_timestamp:
+                        last_assistant_timestamp = timestamp
+
+    except OSError as e:
+        log.warning("Cannot read %s: %s", filepath, e)
+        return None
 
     # Flush remaining assistant data
     if pending_assistant_texts:
         combined = "".join(pending_assistant_texts)
         if combined.strip():
-            turns.append(
+            add_turn(
                 Turn(
                     role="assistant",
                     text=combined,
                     timestamp=last_assistant_timestamp,
-                    thinking_blocks=pending_thinking_blocks.copy(),
-                    sub_agent_refs=pending_sub_agent_refs.copy(),
+                    thinking_blocks=pending_thinking_blocks,
+                    sub_agent_refs=pending_sub_agent_refs,
                 )
             )
 
@@ -325,34 +465,135 @@ def parse_session(filepath: Path) -> Session | None:
         session_id=session_id or filepath.stem,
         turns=turns,
         filepath=filepath,
-        progress_entries=progress_entries_by_parent,
+        # Plain dict so lookups by consumers never insert empty entries
+        progress_entries=dict(progress_entries_by_parent),
     )
 
 
+# Batches smaller than this in total are parsed in-process: a pool's startup
+# (re-importing the package per worker under spawn) outweighs the decoding.
+_PARALLEL_PARSE_BYTES_THRESHOLD = 8 << 20
+
+
+def _parse_files(
+    files: list[Path], parallel: bool, total_bytes: int
+) -> list[Session | None]:
+    """Parse JSONL files, in worker processes when the batch is large enough.
+
+    Args:
+        files: Session files to parse
+        parallel: Whether a process pool may be used
+        total_bytes: Combined size of files, compared against
+            _PARALLEL_PARSE_BYTES_THRESHOLD
+
+    Returns:
+        parse_session result for each file, in the same order
+    """
+    if parallel and len(files) > 1 and total_bytes > _PARALLEL_PARSE_BYTES_THRESHOLD:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=min(len(files), os.cpu_count() or 1),
+                initializer=init_worker_logging,
+                initargs=(log.level, bool(log.handlers)),
+            )
+        except (OSError, NotImplementedError) as e:
+            log.debug("Process pool unavailable, parsing sequentially: %s", e)
+        else:
+            with executor:
+                return list(executor.map(parse_session, files, chunksize=4))
+    return [parse_session(f) for f in files]
+
+
+# The prefetch thread rediscovers sessions every few seconds; CLAUDE_DIR's
+# resolution is reused, keyed on the path so a rebound CLAUDE_DIR re-resolves.
+@functools.lru_cache(maxsize=1)
+def _resolve_root(root: Path) -> Path:
+    """Return root.resolve(), cached per distinct root."""
+    return root.resolve()
+
+
 def discover_sessions(
     project_dir: Path,
     start_time: float,
     session_id: str | None = None,
+    parallel: bool = True,
+    previous_stats: dict[Path, tuple[int, int]] | None = None,
 ) -> list[Session]:
-    """Find and parse JSONL session files."""
+    """Find and parse JSONL session files.
+
+    With parallel=True, files that need parsing are spread across worker
+    processes. Pass False from non-main threads, where forking is unsafe.
+
+    When previous_stats is given, only files whose (mtime_ns, size) matches
+    their entry from the previous call are parsed; files still being written
+    are skipped. The mapping is updated in place with this pass's stats.
+    """
     if not project_dir.is_dir():
         log.warning("Project directory not found: %s", project_dir)
         return []
 
     # Security check (SEC-006): verify path is under CLAUDE_DIR
     try:
-        project_dir.resolve().relative_to(CLAUDE_DIR.resolve())
+        project_dir.resolve().relative_to(_resolve_root(CLAUDE_DIR))
     except ValueError:
         log.warning("Project directory %s is not under %s", project_dir, CLAUDE_DIR)
         return []
 
-    sessions = []
-    for jsonl_file in sorted(project_dir.glob("*.jsonl")):
+    try:
+        with os.scandir(project_dir) as it:
+            dir_entries = sorted(
+                (e for e in it if e.name.endswith(".jsonl")), key=lambda e: e.name
+            )
+    except OSError:
+        log.warning("Could not list project directory %s", project_dir)
+        return []
+
+    candidates: list[Path] = []
+    to_parse: list[Path] = []
+    stats: dict[Path, tuple[int, int]] = {}
+    results: dict[Path, Session | None] = {}
+    # Compared in integer nanoseconds, like the parse cache keys; 0 disables
+    start_ns = int(start_time * 1_000_000_000) if start_time > 0 else 0
+    for dir_entry in dir_entries:
+        try:
+            st = dir_entry.stat()
+        except OSError:
+            continue
+        jsonl_file = Path(dir_entry.path)
+
         # Filter by modification time (post-hoc discovery)
-        if start_time > 0 and jsonl_file.stat().st_mtime < start_time:
+        mtime_ns = st.st_mtime_ns
+        if start_ns and mtime_ns < start_ns:
             continue
 
-        session = parse_session(jsonl_file)
+        stat_key = (mtime_ns, st.st_size)
+        # Changed since the previous pass: still being written, try again later
+        if previous_stats is not None and previous_stats.get(jsonl_file) != stat_key:
+            previous_stats[jsonl_file] = stat_key
+            continue
+
+        candidates.append(jsonl_file)
+        stats[jsonl_file] = stat_key
+        # Files unchanged since an earlier discovery pass are not re-parsed
+        cached = _parse_cache.get(jsonl_file)
+        if cached is None or cached[:2] != stats[jsonl_file]:
+            to_parse.append(jsonl_file)
+        else:
+            _parse_cache.move_to_end(jsonl_file)
+            results[jsonl_file] = cached[2]
+
+    total_bytes = sum(stats[f][1] for f in to_parse)
+    parsed_files = _parse_files(to_parse, parallel, total_bytes)
+    for jsonl_file, parsed in zip(to_parse, parsed_files):
+        _parse_cache[jsonl_file] = (*stats[jsonl_file], parsed)
+        _parse_cache.move_to_end(jsonl_file)
+        results[jsonl_file] = parsed
+    while len(_parse_cache) > _PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)
+
+    sessions = []
+    for jsonl_file in candidates:
+        session = results[jsonl_file]
         if session is None:
             continue
 
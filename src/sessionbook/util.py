@@ -1,13 +1,34 @@
 """Shared utilities for sessionbook."""
 
+import functools
 import logging
-import re
+import string
 
 log = logging.getLogger("sessionbook")
 
-AGENT_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+LOG_FORMAT = "[sessionbook] %(message)s"
 
+# Allowed characters for agent IDs: [a-zA-Z0-9_-]
+AGENT_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+AGENT_ID_MAX_LENGTH = 128
 
+
+def init_worker_logging(level: int, has_handler: bool) -> None:
+    """Process pool initializer that mirrors the parent's logger setup.
+
+    Forked workers inherit the configured logger, but spawned ones start
+    with a bare one and would drop --verbose output.
+    """
+    if has_handler and not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log.addHandler(handler)
+    log.setLevel(level)
+
+
+# Agent IDs recur across turns and sessions; results (and the warning for a
+# bad ID) are computed once per distinct value.
+@functools.lru_cache(maxsize=1024)
 def validate_agent_id(agent_id: str) -> bool:
     """Validate sub-agent identifier against security pattern.
 
@@ -15,14 +36,16 @@ def validate_agent_id(agent_id: str) -> bool:
         agent_id: String to validate
 
     Returns:
-        True if agent_id matches ^[a-zA-Z0-9_-]+$, False otherwise
+        True if agent_id is 1-128 characters from [a-zA-Z0-9_-], False otherwise
 
     Security:
         Prevents path traversal attacks (SEC-002, SEC-003)
     """
     if not agent_id:
         return False
-    if not AGENT_ID_PATTERN.match(agent_id):
+    # A set check is a single C loop and, unlike a ^...$ regex, cannot be
+    # satisfied by a trailing newline
+    if len(agent_id) > AGENT_ID_MAX_LENGTH or not AGENT_ID_CHARS.issuperset(agent_id):
         log.warning("Invalid agent_id: %s (path traversal attempt?)", agent_id)
         return False
     return True
@@ -9,7 +9,6 @@ Covers:
 - Large single turn (100KB)
 """
 
-import json
 import os
 import time
 from pathlib import Path
@@ -18,37 +17,58 @@ import pytest
 
 from sessionbook.jsonl import Turn, Session, parse_session, encode_project_path
 from sessionbook.html import build_html, save_html, _compute_filename
-
+from tests.helpers import dumps
 
 # ---------------------------------------------------------------------------
-# Helper: write a JSONL file with N user/assistant turn pairs
+# Helpers: build JSONL turn lines as UTF-8 bytes
 # ---------------------------------------------------------------------------
 
 
-def _make_jsonl_lines(n_turns: int) -> str:
+def _jsonl_turn(
+    role: str,
+    text: str,
+    timestamp: str,
+    session_id: str,
+    request_id: str | None = None,
+) -> bytes:
+    """Serialize one user or assistant entry as a newline-terminated line."""
+    if role == "user":
+        entry: dict = {
+            "type": "user",
+            "sessionId": session_id,
+            "timestamp": timestamp,
+            "message": {"role": "user", "content": text},
+        }
+    else:
+        entry = {
+            "type": "assistant",
+            "sessionId": session_id,
+            "timestamp": timestamp,
+            "requestId": request_id,
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "text", "text": text}],
+            },
+        }
+    return dumps(entry) + b"\n"
+
+
+def _make_jsonl_lines(n_turns: int) -> bytes:
     """Generate n_turns alternating user/assistant JSONL lines."""
-    lines = []
-    for i in range(n_turns):
-        if i % 2 == 0:
-            entry = {
-                "type": "user",
-                "sessionId": "bench-session",
-                "timestamp": f"2026-02-07T10:00:{i:02d}Z",
-                "message": {"role": "user", "content": f"User message {i}"},
-            }
-        else:
-            entry = {
-                "type": "assistant",
-                "sessionId": "bench-session",
-                "timestamp": f"2026-02-07T10:00:{i:02d}Z",
-                "requestId": f"req-{i}",
-                "message": {
-                    "role": "assistant",
-                    "content": [{"type": "text", "text": f"Assistant response {i}"}],
-                },
-            }
-        lines.append(json.dumps(entry))
-    return "\n".join(lines) + "\n"
+    return b"".join(
+        _jsonl_turn(
+            "user", f"User message {i}", f"2026-02-07T10:00:{i:02d}Z", "bench-session"
+        )
+        if i % 2 == 0
+        else _jsonl_turn(
+            "assistant",
+            f"Assistant response {i}",
+            f"2026-02-07T10:00:{i:02d}Z",
+            "bench-session",
+            f"req-{i}",
+        )
+        for i in range(n_turns)
+    )
 
 
 # ===========================================================================
@@ -67,7 +87,7 @@ class TestLargeSessionBenchmark:
     def large_jsonl(self, tmp_path):
         """Create a 1000-turn JSONL file in a temp directory."""
         filepath = tmp_path / "large_session.jsonl"
-        filepath.write_text(_make_jsonl_lines(1000))
+        filepath.write_bytes(_make_jsonl_lines(1000))
         return filepath
 
     def test_parse_session_under_2_seconds(self, large_jsonl):
@@ -112,38 +132,28 @@ class TestHalfMalformedJsonl:
         for i in range(20):
             if i % 2 == 0:
                 # Valid line
+                timestamp = f"2026-02-07T10:00:{valid_count:02d}Z"
                 if valid_count % 2 == 0:
-                    entry = {
-                        "type": "user",
-                        "sessionId": "malformed-sess",
-                        "timestamp": f"2026-02-07T10:00:{valid_count:02d}Z",
-                        "message": {
-                            "role": "user",
-                            "content": f"Valid user message {valid_count}",
-                        },
-                    }
+                    line = _jsonl_turn(
+                        "user",
+                        f"Valid user message {valid_count}",
+                        timestamp,
+                        "malformed-sess",
+                    )
                 else:
-                    entry = {
-                        "type": "assistant",
-                        "sessionId": "malformed-sess",
-                        "timestamp": f"2026-02-07T10:00:{valid_count:02d}Z",
-                        "requestId": f"req-{valid_count}",
-                        "message": {
-                            "role": "assistant",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": f"Valid assistant response {valid_count}",
-                                }
-                            ],
-                        },
-                    }
-                lines.append(json.dumps(entry))
+                    line = _jsonl_turn(
+                        "assistant",
+                        f"Valid assistant response {valid_count}",
+                        timestamp,
+                        "malformed-sess",
+                        f"req-{valid_count}",
+                    )
+                lines.append(line)
                 valid_count += 1
             else:
                 # Invalid JSON line
-                lines.append(f"{{{{this is not valid json line {i}")
-        filepath.write_text("\n".join(lines) + "\n")
+                lines.append(f"{{{{this is not valid json line {i}\n".encode())
+        filepath.write_bytes(b"".join(lines))
         return filepath, valid_count
 
     def test_valid_turns_extracted(self, half_malformed_jsonl):
@@ -271,13 +281,9 @@ class TestWhitespaceOnlyContent:
     def test_whitespace_user_returns_none(self, tmp_path):
         """A session with only whitespace user content produces no turns."""
         filepath = tmp_path / "whitespace.jsonl"
-        entry = {
-            "type": "user",
-            "sessionId": "ws-sess",
-            "timestamp": "2026-02-07T10:00:00Z",
-            "message": {"role": "user", "content": "   \n\t  "},
-        }
-        filepath.write_text(json.dumps(entry) + "\n")
+        filepath.write_bytes(
+            _jsonl_turn("user", "   \n\t  ", "2026-02-07T10:00:00Z", "ws-sess")
+        )
         session = parse_session(filepath)
         # parse_session returns None when no extractable turns
         assert session is None
@@ -285,17 +291,11 @@ class TestWhitespaceOnlyContent:
     def test_whitespace_assistant_returns_none(self, tmp_path):
         """An assistant turn with only whitespace text in content blocks."""
         filepath = tmp_path / "ws_assistant.jsonl"
-        entry = {
-            "type": "assistant",
-            "sessionId": "ws-sess",
-            "timestamp": "2026-02-07T10:00:00Z",
-            "requestId": "req-ws",
-            "message": {
-                "role": "assistant",
-                "content": [{"type": "text", "text": "   \n\t  "}],
-            },
-        }
-        filepath.write_text(json.dumps(entry) + "\n")
+        filepath.write_bytes(
+            _jsonl_turn(
+                "assistant", "   \n\t  ", "2026-02-07T10:00:00Z", "ws-sess", "req-ws"
+            )
+        )
         session = parse_session(filepath)
         # The text "   \n\t  " is non-empty but the collapsed result with
         # strip() is empty, so _flush_assistant skips it -> returns None
@@ -304,37 +304,13 @@ class TestWhitespaceOnlyContent:
     def test_mixed_whitespace_and_real_content(self, tmp_path):
         """Whitespace-only entries are skipped; real entries are kept."""
         filepath = tmp_path / "mixed_ws.jsonl"
-        lines = [
-            json.dumps(
-                {
-                    "type": "user",
-                    "sessionId": "ws-sess",
-                    "timestamp": "2026-02-07T10:00:00Z",
-                    "message": {"role": "user", "content": "   "},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "user",
-                    "sessionId": "ws-sess",
-                    "timestamp": "2026-02-07T10:00:01Z",
-                    "message": {"role": "user", "content": "Real question"},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "assistant",
-                    "sessionId": "ws-sess",
-                    "timestamp": "2026-02-07T10:00:02Z",
-                    "requestId": "req-1",
-                    "message": {
-                        "role": "assistant",
-                        "content": [{"type": "text", "text": "Real answer"}],
-                    },
-                }
-            ),
-        ]
-        filepath.write_text("\n".join(lines) + "\n")
+        filepath.write_bytes(
+            _jsonl_turn("user", "   ", "2026-02-07T10:00:00Z", "ws-sess")
+            + _jsonl_turn("user", "Real question", "2026-02-07T10:00:01Z", "ws-sess")
+            + _jsonl_turn(
+                "assistant", "Real answer", "2026-02-07T10:00:02Z", "ws-sess", "req-1"
+            )
+        )
         session = parse_session(filepath)
         assert session is not None
         assert len(session.turns) == 2
@@ -347,70 +323,58 @@ class TestWhitespaceOnlyContent:
 # ===========================================================================
 
 
+_LARGE_TEXT = "A" * (100 * 1024)  # 100KB
+
+# Serialized once at import; the payload shape never changes between tests
+_LARGE_TURN_JSONL = _jsonl_turn(
+    "user", "Generate a lot of text", "2026-02-07T10:00:00Z", "large-sess"
+) + _jsonl_turn(
+    "assistant", _LARGE_TEXT, "2026-02-07T10:00:01Z", "large-sess", "req-large"
+)
+
+
 class TestLargeSingleTurn:
     """A single assistant turn with 100KB of text."""
 
-    @pytest.fixture()
-    def large_turn_jsonl(self, tmp_path):
-        filepath = tmp_path / "large_turn.jsonl"
-        large_text = "A" * (100 * 1024)  # 100KB
-        lines = [
-            json.dumps(
-                {
-                    "type": "user",
-                    "sessionId": "large-sess",
-                    "timestamp": "2026-02-07T10:00:00Z",
-                    "message": {"role": "user", "content": "Generate a lot of text"},
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "assistant",
-                    "sessionId": "large-sess",
-                    "timestamp": "2026-02-07T10:00:01Z",
-                    "requestId": "req-large",
-                    "message": {
-                        "role": "assistant",
-                        "content": [{"type": "text", "text": large_text}],
-                    },
-                }
-            ),
-        ]
-        filepath.write_text("\n".join(lines) + "\n")
-        return filepath, large_text
-
-    def test_parse_does_not_crash(self, large_turn_jsonl):
-        filepath, large_text = large_turn_jsonl
-        session = parse_session(filepath)
-        assert session is not None
-        assert len(session.turns) == 2
-
-    def test_text_preserved(self, large_turn_jsonl):
-        filepath, large_text = large_turn_jsonl
-        session = parse_session(filepath)
-        assert session is not None
-        assistant_turn = [t for t in session.turns if t.role == "assistant"][0]
+    @pytest.fixture(scope="class")
+    @classmethod
+    def large_turn_jsonl(cls, tmp_path_factory):
+        # Shared by the class: none of the tests modify the input file
+        filepath = tmp_path_factory.mktemp("large") / "large_turn.jsonl"
+        filepath.write_bytes(_LARGE_TURN_JSONL)
+        return filepath, _LARGE_TEXT
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def large_session(cls, large_turn_jsonl):
+        # Parsed once; the tests below only read the session
+        return parse_session(large_turn_jsonl[0])
+
+    def test_parse_does_not_crash(self, large_session):
+        assert large_session is not None
+        assert len(large_session.turns) == 2
+
+    def test_text_preserved(self, large_session, large_turn_jsonl):
+        _, large_text = large_turn_jsonl
+        assert large_session is not None
+        assistant_turn = next(t for t in large_session.turns if t.role == "assistant")
         assert len(assistant_turn.text) == len(large_text)
         assert assistant_turn.text == large_text
 
-    def test_html_valid(self, large_turn_jsonl, tmp_path):
-        filepath, _ = large_turn_jsonl
-        session = parse_session(filepath)
-        assert session is not None
-        html = build_html(session)
+    def test_html_valid(self, large_session):
+        assert large_session is not None
+        html = build_html(large_session)
         assert "<!DOCTYPE html>" in html
         # Verify the HTML contains the large text
         assert len(html) > 100 * 1024
 
-    def test_save_html_large_turn(self, large_turn_jsonl, tmp_path):
-        filepath, _ = large_turn_jsonl
-        session = parse_session(filepath)
-        assert session is not None
+    def test_save_html_large_turn(self, large_session, tmp_path):
+        assert large_session is not None
         output_dir = tmp_path / "output"
-        result = save_html(session, output_dir)
+        result = save_html(large_session, output_dir)
         assert result is not None
         assert result.exists()
         # Verify the saved file is valid HTML
-        html_content = result.read_text()
-        assert "<!DOCTYPE html>" in html_content
-        assert 'name="sessionbook-session-id"' in html_content
+        html_bytes = result.read_bytes()
+        assert b"<!DOCTYPE html>" in html_bytes
+        assert b'name="sessionbook-session-id"' in html_bytes
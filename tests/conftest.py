@@ -0,0 +1,34 @@
+"""Shared fixtures for the sessionbook test suite."""
+
+from pathlib import Path
+
+import pytest
+
+from sessionbook.jsonl import encode_project_path
+from tests.helpers import patch_claude_env
+
+
+@pytest.fixture
+def patch_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Return a function that applies patch_claude_env with tmp_path/projects
+    and the given work_dir, for the rest of the test."""
+    projects_dir = tmp_path / "projects"
+
+    def apply(work_dir: Path) -> None:
+        patch_claude_env(monkeypatch, projects_dir, work_dir)
+
+    return apply
+
+
+@pytest.fixture
+def project_env(tmp_path: Path) -> tuple[Path, Path, Path]:
+    """Create the working directory and its (empty) Claude project directory.
+
+    Returns (work_dir, project_dir, sessionbook_dir), all under tmp_path;
+    sessionbook_dir is the not-yet-created output directory in work_dir.
+    """
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    project_dir = tmp_path / "projects" / encode_project_path(work_dir)
+    project_dir.mkdir(parents=True)
+    return work_dir, project_dir, work_dir / ".sessionbook"
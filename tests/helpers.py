@@ -0,0 +1,107 @@
+"""Plain helpers shared by the sessionbook test modules.
+
+Fixtures built on these live in conftest.py.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+try:
+    import orjson
+
+    def dumps(obj: dict) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:  # optional speedup, see the "fast" extra
+
+    def dumps(obj: dict) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+
+# The 4-entry session (2 user, 2 assistant) is serialized once; only the
+# session id varies between calls.
+SESSION_JSONL_TEMPLATE = b"".join(
+    dumps(entry) + b"\n"
+    for entry in [
+        {
+            "type": "user",
+            "sessionId": "__SID__",
+            "timestamp": "2026-02-07T10:00:00Z",
+            "message": {"role": "user", "content": "Hello"},
+        },
+        {
+            "type": "assistant",
+            "sessionId": "__SID__",
+            "timestamp": "2026-02-07T10:00:01Z",
+            "requestId": "req-1",
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "text", "text": "Hi there!"}],
+            },
+        },
+        {
+            "type": "user",
+            "sessionId": "__SID__",
+            "timestamp": "2026-02-07T10:00:02Z",
+            "message": {"role": "user", "content": "Bye"},
+        },
+        {
+            "type": "assistant",
+            "sessionId": "__SID__",
+            "timestamp": "2026-02-07T10:00:03Z",
+            "requestId": "req-2",
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "text", "text": "Goodbye!"}],
+            },
+        },
+    ]
+)
+
+
+def write_session_jsonl(
+    directory: Path,
+    filename: str = "session.jsonl",
+    session_id: str = "sess-test",
+) -> Path:
+    """Write a valid 4-entry JSONL file (2 user, 2 assistant) to *directory*.
+
+    Returns the path to the created file.
+    """
+    filepath = directory / filename
+    filepath.write_bytes(
+        SESSION_JSONL_TEMPLATE.replace(b"__SID__", session_id.encode())
+    )
+    return filepath
+
+
+def list_html_files(directory: Path) -> list[Path]:
+    """Return the .html files directly inside *directory*, or [] if it
+    does not exist."""
+    try:
+        with os.scandir(directory) as it:
+            return [Path(e.path) for e in it if e.name.endswith(".html")]
+    except FileNotFoundError:
+        return []
+
+
+def patch_claude_env(
+    mp: pytest.MonkeyPatch, projects_dir: Path, work_dir: Path
+) -> None:
+    """Point CLAUDE_DIR at *projects_dir* in both modules and make Path.cwd()
+    return *work_dir*.
+
+    capture.py imports CLAUDE_DIR at module level via:
+        from sessionbook.jsonl import CLAUDE_DIR
+    so the binding in the capture namespace must be patched separately.
+
+    discover_sessions() in jsonl.py does a security check (SEC-006):
+        project_dir.resolve().relative_to(CLAUDE_DIR.resolve())
+    so jsonl.CLAUDE_DIR must also point to the same temp root.
+    """
+    mp.setattr("sessionbook.capture.CLAUDE_DIR", projects_dir)
+    mp.setattr("sessionbook.jsonl.CLAUDE_DIR", projects_dir)
+    mp.setattr(Path, "cwd", staticmethod(lambda: work_dir))
@@ -7,24 +7,55 @@ and sub-agent references.
 Requirement trace: REQ-012, REQ-015, SEC-002, SEC-003, SEC-004, SEC-005.
 """
 
+import errno
 import os
+import re
+from datetime import datetime
 from pathlib import Path
+from unittest import mock
 
+import pytest
 
 from sessionbook.html import (
+    _append_index,
     _compute_filename,
     _escape_html,
     _existing_session_ids,
+    _load_index,
+    _render_markdown,
     _render_sub_agent_card,
     _render_thinking_block,
     _render_turn_html,
     _render_user_choice,
     _validate_agent_id,
     build_html,
+    md,
     save_html,
 )
 from sessionbook.jsonl import Session, SubAgentRef, ThinkingBlock, Turn, UserChoice
 
+_TEST_FILEPATH = Path("/tmp/test.jsonl")
+_ORDERED_TURN_TEXT_RE = re.compile(r"First|Second|Third")
+_LONG_SUMMARY = "A" * 600
+_CHOICE_ITEM_RE = re.compile(r'<li class="([^"]+)">([^<]+)</li>')
+_DEFAULT_TURNS = (Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z"),)
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    """Build a Session from keyword overrides of a one-turn default."""
+
+    def make(**overrides) -> Session:
+        fields = {
+            "session_id": "test",
+            "turns": list(_DEFAULT_TURNS),
+            "filepath": _TEST_FILEPATH,
+        }
+        fields.update(overrides)
+        return Session(**fields)
+
+    return make
+
 
 # ---------------------------------------------------------------------------
 # _escape_html
@@ -34,47 +65,91 @@ from sessionbook.jsonl import Session, SubAgentRef, ThinkingBlock, Turn, UserCho
 class TestEscapeHtml:
     """Tests for _escape_html XSS prevention (SEC-002)."""
 
-    def test_script_tag_escaped(self):
-        """<script> tags are escaped to prevent XSS."""
-        result = _escape_html("<script>alert(1)</script>")
-        assert result == "&lt;script&gt;alert(1)&lt;/script&gt;"
-        assert "<script>" not in result
-
-    def test_attributes_escaped(self):
-        """Quotes in attributes are escaped."""
-        result = _escape_html('"onmouseover="alert(1)"')
-        assert result == "&quot;onmouseover=&quot;alert(1)&quot;"
-        assert "onmouseover=" not in result or "&quot;" in result
-
-    def test_ampersand_escaped(self):
-        """& is escaped to &amp;."""
-        result = _escape_html("A & B")
-        assert result == "A &amp; B"
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            # <script> tags are escaped to prevent XSS
+            pytest.param(
+                "<script>alert(1)</script>",
+                "&lt;script&gt;alert(1)&lt;/script&gt;",
+                id="script-tag",
+            ),
+            # Quotes in attributes are escaped
+            pytest.param(
+                '"onmouseover="alert(1)"',
+                "&quot;onmouseover=&quot;alert(1)&quot;",
+                id="attribute-quotes",
+            ),
+            pytest.param("A & B", "A &amp; B", id="ampersand"),
+            # Non-string input is converted to string first
+            pytest.param(42, "42", id="int"),
+            pytest.param(None, "None", id="none"),
+            pytest.param("", "", id="empty"),
+            # Text without special characters is unchanged
+            pytest.param("Hello World", "Hello World", id="plain-text"),
+        ],
+    )
+    def test_escaped(self, raw, expected):
+        """Input is converted to str and HTML-escaped."""
+        assert _escape_html(raw) == expected
+
+    def test_plain_text_skips_escape(self):
+        """Text with nothing to escape is returned unchanged without calling
+        html.escape."""
+        with mock.patch("sessionbook.html.html.escape") as mock_escape:
+            assert _escape_html("Hello World") == "Hello World"
+        mock_escape.assert_not_called()
 
     def test_single_quote_escaped(self):
         """Single quotes are escaped."""
         result = _escape_html("It's a test")
         assert "&" in result or "'" in result  # May be &#x27; or &apos;
 
-    def test_non_string_converted(self):
-        """Non-string input is converted to string first."""
-        result = _escape_html(42)
-        assert result == "42"
 
-    def test_none_converted(self):
-        """None is converted to string."""
-        result = _escape_html(None)
-        assert result == "None"
+# ---------------------------------------------------------------------------
+# _render_markdown
+# ---------------------------------------------------------------------------
 
-    def test_empty_string(self):
-        """Empty string is handled."""
-        result = _escape_html("")
-        assert result == ""
 
-    def test_normal_text_unchanged(self):
-        """Text without special characters is unchanged."""
-        result = _escape_html("Hello World")
-        assert result == "Hello World"
+class TestRenderMarkdown:
+    """Tests for _render_markdown plain-text fast path."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Hello world",
+            "Fix the bug in line 42 please",
+            "really?!?!",
+            "wait,, what",
+            "see example.com",
+            "mail me@example",
+            "1) first",
+            "a & b",
+            'It\'s "quoted"',
+            "(c) 2026 -- done...",
+            "  padded  ",
+            "two\nlines",
+            "",
+        ],
+    )
+    def test_matches_full_render(self, text):
+        """Fast path output is identical to the markdown-it render."""
+        assert _render_markdown(text) == md.render(text)
+
+    def test_cache_renders_repeated_text_once(self):
+        """With a cache, identical markdown is parsed only once."""
+        cache: dict[str, str] = {}
+        text = "Some **bold** text"
+        with mock.patch("sessionbook.html.md.render", wraps=md.render) as render:
+            first = _render_markdown(text, cache)
+            second = _render_markdown(text, cache)
+        assert first == second
+        assert render.call_count == 1
+        assert cache == {text: first}
+
+    def test_plain_text_wrapped_in_paragraph(self):
+        """Plain text is emitted as a single paragraph."""
+        assert _render_markdown("Hello world") == "<p>Hello world</p>\n"
 
 
 # ---------------------------------------------------------------------------
@@ -85,45 +160,37 @@ class TestEscapeHtml:
 class TestValidateAgentId:
     """Tests for _validate_agent_id path traversal prevention (SEC-003)."""
 
-    def test_valid_alphanumeric(self):
-        """Valid alphanumeric IDs are accepted."""
-        assert _validate_agent_id("abc123") is True
-
-    def test_valid_with_dash(self):
-        """IDs with dashes are accepted."""
-        assert _validate_agent_id("agent-1") is True
-
-    def test_valid_with_underscore(self):
-        """IDs with underscores are accepted."""
-        assert _validate_agent_id("a_b") is True
-
-    def test_valid_mixed(self):
-        """Mixed alphanumeric, dash, and underscore are accepted."""
-        assert _validate_agent_id("agent-123_test") is True
-
-    def test_path_traversal_rejected(self):
-        """Path traversal attempts are rejected."""
-        assert _validate_agent_id("../../../etc/passwd") is False
-
-    def test_empty_string_rejected(self):
-        """Empty string is rejected."""
-        assert _validate_agent_id("") is False
-
-    def test_slash_rejected(self):
-        """IDs with slashes are rejected."""
-        assert _validate_agent_id("agent/bad") is False
-
-    def test_null_byte_rejected(self):
-        """IDs with null bytes are rejected."""
-        assert _validate_agent_id("agent\x00bad") is False
-
-    def test_dot_rejected(self):
-        """IDs with dots are rejected (path traversal risk)."""
-        assert _validate_agent_id("agent.bad") is False
-
-    def test_space_rejected(self):
-        """IDs with spaces are rejected."""
-        assert _validate_agent_id("agent bad") is False
+    @pytest.mark.parametrize(
+        ("agent_id", "expected"),
+        [
+            pytest.param("abc123", True, id="alphanumeric"),
+            pytest.param("agent-1", True, id="dash"),
+            pytest.param("a_b", True, id="underscore"),
+            pytest.param("agent-123_test", True, id="mixed"),
+            # Path traversal and separator characters are rejected
+            pytest.param("../../../etc/passwd", False, id="path-traversal"),
+            pytest.param("", False, id="empty"),
+            pytest.param("agent/bad", False, id="slash"),
+            pytest.param("agent\x00bad", False, id="null-byte"),
+            pytest.param("agent.bad", False, id="dot"),
+            pytest.param("agent bad", False, id="space"),
+            # A trailing newline does not slip through
+            pytest.param("agent\n", False, id="trailing-newline"),
+        ],
+    )
+    def test_validation(self, agent_id, expected):
+        """IDs are limited to ASCII letters, digits, dash and underscore."""
+        assert _validate_agent_id(agent_id) is expected
+
+    def test_non_ascii_rejected(self):
+        """Non-ASCII letters and digits are rejected."""
+        assert _validate_agent_id("agént") is False
+        assert _validate_agent_id("agent٣") is False
+
+    def test_length_cap(self):
+        """IDs longer than 128 characters are rejected."""
+        assert _validate_agent_id("a" * 128) is True
+        assert _validate_agent_id("a" * 129) is False
 
 
 # ---------------------------------------------------------------------------
@@ -194,9 +261,12 @@ class TestRenderUserChoice:
             selected_index=1,
         )
         result = _render_user_choice(choice)
-        assert "First" in result
-        assert "Second" in result
-        assert "Third" in result
+        items = {m[2]: m[1] for m in _CHOICE_ITEM_RE.finditer(result)}
+        assert items == {
+            "First": "choice-option",
+            "Second": "choice-option choice-selected",
+            "Third": "choice-option",
+        }
 
     def test_selected_option_highlighted(self):
         """Selected option has choice-selected class."""
@@ -218,8 +288,9 @@ class TestRenderUserChoice:
         )
         result = _render_user_choice(choice)
         # A and C should not have choice-selected class
-        assert 'class="choice-option">A</li>' in result
-        assert 'class="choice-option">C</li>' in result
+        items = {m[2]: m[1] for m in _CHOICE_ITEM_RE.finditer(result)}
+        assert items["A"] == "choice-option"
+        assert items["C"] == "choice-option"
 
     def test_question_escaped(self):
         """Question text is HTML-escaped."""
@@ -309,19 +380,18 @@ class TestRenderSubAgentCard:
 
     def test_summary_truncated(self):
         """Summary is truncated to 500 characters."""
-        long_summary = "A" * 600
         ref = SubAgentRef(
             agent_id="test-agent",
             subagent_type="executor",
             description="Test task",
-            summary=long_summary,
+            summary=_LONG_SUMMARY,
             transcript_path=None,
         )
         result = _render_sub_agent_card(ref)
         # Should have ellipsis
         assert "..." in result
         # Should not have full 600 chars
-        assert long_summary not in result
+        assert _LONG_SUMMARY not in result
 
     def test_content_escaped(self):
         """Sub-agent card content is HTML-escaped."""
@@ -431,49 +501,37 @@ class TestRenderTurnHtml:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.slow
 class TestBuildHtml:
     """Tests for build_html (full HTML generation)."""
 
-    def test_contains_doctype(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def rendered_single_turn_html(cls, session_factory):
+        """build_html output for the default one-turn session, rendered once."""
+        return build_html(session_factory(session_id="test-session"))
+
+    def test_contains_doctype(self, rendered_single_turn_html):
         """Generated HTML contains DOCTYPE."""
-        session = Session(
-            session_id="test-session",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
-        result = build_html(session)
+        result = rendered_single_turn_html
         assert "<!DOCTYPE html>" in result
 
-    def test_contains_meta_tags(self):
+    def test_contains_meta_tags(self, rendered_single_turn_html):
         """Generated HTML contains meta tags."""
-        session = Session(
-            session_id="test-session",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
-        result = build_html(session)
+        result = rendered_single_turn_html
         assert '<meta charset="UTF-8">' in result
         assert '<meta name="viewport"' in result
 
-    def test_contains_css(self):
+    def test_contains_css(self, rendered_single_turn_html):
         """Generated HTML contains inline CSS."""
-        session = Session(
-            session_id="test-session",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
-        result = build_html(session)
+        result = rendered_single_turn_html
         assert "<style>" in result
         assert ".turn" in result
         assert "</style>" in result
 
-    def test_session_id_in_meta_tag(self):
+    def test_session_id_in_meta_tag(self, session_factory):
         """Session ID is present in meta tag."""
-        session = Session(
-            session_id="unique-session-id",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
+        session = session_factory(session_id="unique-session-id")
         result = build_html(session)
         assert 'name="sessionbook-session-id"' in result
         assert 'content="unique-session-id"' in result
@@ -487,13 +545,10 @@ class TestBuildHtml:
                 Turn(role="assistant", text="Second", timestamp="2026-02-07T10:00:01Z"),
                 Turn(role="user", text="Third", timestamp="2026-02-07T10:00:02Z"),
             ],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = build_html(session)
-        first_idx = result.find("First")
-        second_idx = result.find("Second")
-        third_idx = result.find("Third")
-        assert first_idx < second_idx < third_idx
+        assert _ORDERED_TURN_TEXT_RE.findall(result) == ["First", "Second", "Third"]
 
     def test_empty_text_escaped(self):
         """Empty or special text is properly escaped."""
@@ -506,12 +561,34 @@ class TestBuildHtml:
                     timestamp="2026-02-07T10:00:00Z",
                 )
             ],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = build_html(session)
         assert "&lt;script&gt;" in result
         assert "<script>alert(1)</script>" not in result
 
+    def test_parallel_turn_rendering_matches_serial(self):
+        """Long sessions rendered on the thread pool match the serial output."""
+        turns = [
+            Turn(
+                role="user" if i % 2 == 0 else "assistant",
+                text=f"Turn {i} with `code`",
+                timestamp="2026-02-07T10:00:00Z",
+                thinking_blocks=[ThinkingBlock(text="hmm")] if i % 7 == 0 else [],
+            )
+            for i in range(250)
+        ]
+        session = Session(session_id="long", turns=turns, filepath=_TEST_FILEPATH)
+        fixed = "2026-02-07T12:00:00"
+        with mock.patch("sessionbook.html.datetime") as mock_dt:
+            mock_dt.now.return_value.isoformat.return_value = fixed
+            mock_dt.fromisoformat = datetime.fromisoformat
+            serial = build_html(session)
+            with mock.patch("sessionbook.html._gil_enabled", return_value=False):
+                parallel = build_html(session)
+        assert parallel == serial
+        assert 'id="turn-249"' in parallel
+
 
 # ---------------------------------------------------------------------------
 # _compute_filename
@@ -526,7 +603,7 @@ class TestComputeFilename:
         session = Session(
             session_id="test",
             turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:15:30Z")],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = _compute_filename(session)
         assert result.endswith(".html")
@@ -539,7 +616,7 @@ class TestComputeFilename:
         session = Session(
             session_id="test",
             turns=[Turn(role="user", text="Test", timestamp="invalid")],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = _compute_filename(session)
         assert result.endswith(".html")
@@ -550,7 +627,7 @@ class TestComputeFilename:
         session = Session(
             session_id="test",
             turns=[],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = _compute_filename(session)
         assert result.endswith(".html")
@@ -561,16 +638,19 @@ class TestComputeFilename:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.slow
+@pytest.mark.io
 class TestSaveHtml:
     """Tests for save_html (atomic write and collision handling)."""
 
-    def test_atomic_write(self, tmp_path):
+    @pytest.fixture(autouse=True)
+    def no_fsync(self, monkeypatch):
+        """Skip the durability flush; these tests only check file semantics."""
+        monkeypatch.setattr(os, "fsync", lambda fd: None)
+
+    def test_atomic_write(self, tmp_path, session_factory):
         """File is written atomically (no .tmp leftover)."""
-        session = Session(
-            session_id="test",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
+        session = session_factory()
         result = save_html(session, tmp_path)
         assert result is not None
         assert result.exists()
@@ -578,13 +658,9 @@ class TestSaveHtml:
         tmp_files = list(tmp_path.glob("*.tmp"))
         assert len(tmp_files) == 0
 
-    def test_collision_handling(self, tmp_path):
+    def test_collision_handling(self, tmp_path, session_factory):
         """Collision handling adds numeric suffix."""
-        session = Session(
-            session_id="test",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
+        session = session_factory()
         # Save first file
         result1 = save_html(session, tmp_path)
         assert result1 is not None
@@ -597,13 +673,66 @@ class TestSaveHtml:
         assert result1 != result2
         assert "-1.html" in result2.name
 
-    def test_permissions(self, tmp_path):
+    def test_existing_names_skip_known_collisions(self, tmp_path, session_factory):
+        """Names in existing_names are treated as taken and the chosen name
+        is recorded in the set."""
+        session = session_factory()
+        taken = _compute_filename(session)
+        existing_names = {taken}
+
+        result = save_html(session, tmp_path, existing_names)
+        assert result is not None
+        assert result.name == taken.replace(".html", "-1.html")
+        assert existing_names == {taken, result.name}
+
+    def test_render_failure_leaves_no_files(self, tmp_path, session_factory):
+        """A rendering error removes the tempfile and never claims a name."""
+        session = session_factory()
+        with (
+            mock.patch("sessionbook.html.write_html", side_effect=RuntimeError),
+            pytest.raises(RuntimeError),
+        ):
+            save_html(session, tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_interrupted_publish_leaves_no_html(self, tmp_path, session_factory):
+        """A save interrupted after rendering leaves no (empty) .html behind."""
+        session = session_factory()
+        with (
+            mock.patch("sessionbook.html.os.link", side_effect=KeyboardInterrupt),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            save_html(session, tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_too_many_collisions_leaves_no_tempfile(self, tmp_path, session_factory):
+        """When every candidate name is taken, the rendered tempfile is
+        removed and None returned."""
+        session = session_factory()
+        base = _compute_filename(session).removesuffix(".html")
+        taken = {f"{base}.html"} | {f"{base}-{n}.html" for n in range(1, 1001)}
+        assert save_html(session, tmp_path, taken) is None
+        assert list(tmp_path.glob("*.tmp")) == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_no_hardlink_fallback(self, tmp_path, session_factory):
+        """Without hard links, names are reserved with a placeholder and the
+        tempfile renamed over it, collisions included."""
+        session = session_factory()
+        with mock.patch(
+            "sessionbook.html.os.link",
+            side_effect=OSError(errno.EPERM, "Operation not permitted"),
+        ):
+            result1 = save_html(session, tmp_path)
+            result2 = save_html(session, tmp_path)
+        assert result1 is not None and result2 is not None
+        assert result2.name == result1.name.replace(".html", "-1.html")
+        assert result1.stat().st_size > 0 and result2.stat().st_size > 0
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_permissions(self, tmp_path, session_factory):
         """File has 0o644 permissions."""
-        session = Session(
-            session_id="test",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
+        session = session_factory()
         result = save_html(session, tmp_path)
         assert result is not None
         mode = os.stat(result).st_mode & 0o777
@@ -614,18 +743,14 @@ class TestSaveHtml:
         session = Session(
             session_id="test",
             turns=[],
-            filepath=Path("/tmp/test.jsonl"),
+            filepath=_TEST_FILEPATH,
         )
         result = save_html(session, tmp_path)
         assert result is None
 
-    def test_unwritable_directory_returns_none(self, tmp_path):
+    def test_unwritable_directory_returns_none(self, tmp_path, session_factory):
         """Unwritable directory returns None."""
-        session = Session(
-            session_id="test",
-            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
-            filepath=Path("/tmp/test.jsonl"),
-        )
+        session = session_factory()
         # Try to write to a non-existent parent directory with no permission to create
         unwritable_dir = Path("/nonexistent/deeply/nested/path")
         result = save_html(session, unwritable_dir)
@@ -637,6 +762,16 @@ class TestSaveHtml:
 # ---------------------------------------------------------------------------
 
 
+_SESSION_HTML_TEMPLATE = b"""<!DOCTYPE html>
+<html>
+<head>
+    <meta name="sessionbook-session-id" content="%b">
+</head>
+<body></body>
+</html>"""
+
+
+@pytest.mark.io
 class TestExistingSessionIds:
     """Tests for _existing_session_ids (scan HTML files for session IDs)."""
 
@@ -654,15 +789,8 @@ class TestExistingSessionIds:
     def test_scan_html_files(self, tmp_path):
         """Extracts session IDs from HTML meta tags."""
         # Create HTML file with session ID
-        html_content = """<!DOCTYPE html>
-<html>
-<head>
-    <meta name="sessionbook-session-id" content="session-123">
-</head>
-<body></body>
-</html>"""
         html_file = tmp_path / "test.html"
-        html_file.write_text(html_content)
+        html_file.write_bytes(_SESSION_HTML_TEMPLATE % b"session-123")
 
         result = _existing_session_ids(tmp_path)
         assert "session-123" in result
@@ -670,15 +798,8 @@ class TestExistingSessionIds:
     def test_scan_multiple_files(self, tmp_path):
         """Extracts session IDs from multiple HTML files."""
         for i in range(3):
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta name="sessionbook-session-id" content="session-{i}">
-</head>
-<body></body>
-</html>"""
             html_file = tmp_path / f"test{i}.html"
-            html_file.write_text(html_content)
+            html_file.write_bytes(_SESSION_HTML_TEMPLATE % f"session-{i}".encode())
 
         result = _existing_session_ids(tmp_path)
         assert "session-0" in result
@@ -693,6 +814,13 @@ class TestExistingSessionIds:
         result = _existing_session_ids(tmp_path)
         assert result == set()
 
+    def test_scan_skips_empty_html(self, tmp_path):
+        """Zero-byte HTML files are skipped without error."""
+        (tmp_path / "empty.html").write_text("")
+
+        result = _existing_session_ids(tmp_path)
+        assert result == set()
+
     def test_scan_handles_malformed_html(self, tmp_path):
         """Malformed HTML files are skipped without error."""
         html_file = tmp_path / "malformed.html"
@@ -700,3 +828,94 @@ class TestExistingSessionIds:
 
         result = _existing_session_ids(tmp_path)
         assert result == set()
+
+    def test_save_records_index_entry(self, tmp_path):
+        """save_html appends the saved file to the index sidecar."""
+        session = Session(
+            session_id="indexed",
+            turns=[Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")],
+            filepath=_TEST_FILEPATH,
+        )
+        result = save_html(session, tmp_path)
+        assert result is not None
+        st = result.stat()
+        assert _load_index(tmp_path) == {
+            result.name: ("indexed", st.st_mtime_ns, st.st_size)
+        }
+        assert _existing_session_ids(tmp_path) == {"indexed"}
+
+    def test_index_used_without_reading_html(self, tmp_path):
+        """Indexed files are trusted without scanning their meta tags."""
+        html_file = tmp_path / "a.html"
+        html_file.write_text("no meta tag here")
+        st = html_file.stat()
+        _append_index(tmp_path, "from-index", "a.html", st.st_mtime_ns, st.st_size)
+
+        result = _existing_session_ids(tmp_path)
+        assert result == {"from-index"}
+
+    def test_index_entry_for_modified_file_rescanned(self, tmp_path):
+        """A file modified after it was indexed is scanned again and the
+        index updated with what it now contains."""
+        html_file = tmp_path / "a.html"
+        html_file.write_text('<meta name="sessionbook-session-id" content="fresh">')
+        st = html_file.stat()
+        _append_index(tmp_path, "stale", "a.html", st.st_mtime_ns - 1, st.st_size)
+
+        assert _existing_session_ids(tmp_path) == {"fresh"}
+        assert _load_index(tmp_path) == {
+            "a.html": ("fresh", st.st_mtime_ns, st.st_size)
+        }
+
+    def test_index_entry_for_older_copy_rescanned(self, tmp_path):
+        """A file replaced by a copy with an older mtime (cp -p, a backup
+        restore) is not trusted from the index."""
+        html_file = tmp_path / "a.html"
+        html_file.write_text('<meta name="sessionbook-session-id" content="first">')
+        st = html_file.stat()
+        _append_index(tmp_path, "first", "a.html", st.st_mtime_ns, st.st_size)
+
+        html_file.write_text('<meta name="sessionbook-session-id" content="other">')
+        os.utime(html_file, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+
+        assert _existing_session_ids(tmp_path) == {"other"}
+
+    def test_index_entry_with_other_size_rescanned(self, tmp_path):
+        """An entry whose recorded size differs from the file is not trusted,
+        even with a matching mtime."""
+        html_file = tmp_path / "a.html"
+        html_file.write_text('<meta name="sessionbook-session-id" content="real">')
+        st = html_file.stat()
+        _append_index(tmp_path, "stale", "a.html", st.st_mtime_ns, st.st_size + 1)
+
+        assert _existing_session_ids(tmp_path) == {"real"}
+
+    def test_index_entry_without_mtime_rescanned(self, tmp_path):
+        """Entries written without an mtime are not trusted."""
+        (tmp_path / "a.html").write_text(
+            '<meta name="sessionbook-session-id" content="scanned">'
+        )
+        (tmp_path / ".index.jsonl").write_text('{"id": "old", "file": "a.html"}\n')
+
+        assert _existing_session_ids(tmp_path) == {"scanned"}
+
+    def test_index_entries_for_deleted_files_ignored(self, tmp_path):
+        """Index entries whose HTML file is gone are not reported."""
+        (tmp_path / ".index.jsonl").write_text(
+            '{"id": "gone", "file": "gone.html"}\nnot json\n'
+        )
+
+        result = _existing_session_ids(tmp_path)
+        assert result == set()
+
+    def test_scan_backfills_index(self, tmp_path):
+        """Files found by the fallback scan are added to the index."""
+        (tmp_path / "old.html").write_text(
+            '<meta name="sessionbook-session-id" content="legacy">'
+        )
+
+        assert _existing_session_ids(tmp_path) == {"legacy"}
+        st = (tmp_path / "old.html").stat()
+        assert _load_index(tmp_path) == {
+            "old.html": ("legacy", st.st_mtime_ns, st.st_size)
+        }
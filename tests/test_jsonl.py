@@ -4,6 +4,7 @@ Requirement trace: REQ-017, REQ-018, REQ-019, REQ-020, DI-002, DI-003,
 ERR-003, ERR-004, ERR-006.
 """
 
+import logging
 import os
 import time
 from pathlib import Path
@@ -60,8 +61,9 @@ class TestEncodeProjectPath:
 class TestParseSimpleSession:
     """Tests for parse_session with a simple 4-turn conversation (REQ-018)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "simple_session.jsonl")
 
     def test_returns_session(self, session):
@@ -110,8 +112,9 @@ class TestParseSimpleSession:
 class TestParseToolUseSession:
     """Tests for parse_session with tool_use, tool_result, and thinking blocks (REQ-019)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "tool_use_session.jsonl")
 
     def test_returns_session(self, session):
@@ -163,8 +166,9 @@ class TestParseToolUseSession:
 class TestParseMalformed:
     """Tests for parse_session with malformed JSONL input (ERR-003, ERR-004)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "malformed.jsonl")
 
     def test_no_crash(self, session):
@@ -182,6 +186,50 @@ class TestParseMalformed:
         assert session.turns[0].role == "user"
         assert session.turns[1].role == "assistant"
 
+    def test_streamed_read_matches_whole_file_read(self):
+        """Files above the slurp limit are streamed with identical results."""
+        for fixture in sorted(FIXTURES.glob("*.jsonl")):
+            whole = parse_session(fixture)
+            with mock.patch("sessionbook.jsonl._SLURP_LIMIT", 0):
+                streamed = parse_session(fixture)
+            assert streamed == whole, fixture.name
+
+    def test_invalid_utf8_line_skipped(self, tmp_path):
+        """A line that is not valid UTF-8 is skipped like any malformed line."""
+        f = tmp_path / "bad_utf8.jsonl"
+        f.write_bytes(
+            b'{"type": "user", "message": {"role": "user", "content": "\xff\xfe"}}\n'
+            b'{"type": "user", "sessionId": "s", "timestamp": "t", '
+            b'"message": {"role": "user", "content": "ok"}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["ok"]
+
+    def test_non_object_line_skipped(self, tmp_path):
+        """Valid JSON that is not an object is skipped like a malformed line."""
+        f = tmp_path / "non_object.jsonl"
+        f.write_text(
+            '["user", "assistant"]\n'
+            '"progress"\n'
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "ok"}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["ok"]
+
+    def test_non_strict_json_accepted(self, tmp_path):
+        """Lines only the stdlib parser accepts (e.g. NaN) still parse."""
+        f = tmp_path / "nan.jsonl"
+        f.write_text(
+            '{"type": "user", "sessionId": "s", "timestamp": "t", "cost": NaN, '
+            '"message": {"role": "user", "content": "still here"}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert session.turns[0].text == "still here"
+
 
 # ---------------------------------------------------------------------------
 # parse_session -- empty.jsonl
@@ -204,8 +252,9 @@ class TestParseEmpty:
 class TestParseUnicode:
     """Tests for parse_session with unicode content (REQ-020)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "unicode_session.jsonl")
 
     def test_returns_session(self, session):
@@ -239,8 +288,9 @@ class TestParseUnicode:
 class TestRequestIdCollapsing:
     """Tests for requestId collapsing behavior (DI-003)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "requestid_collapse.jsonl")
 
     def test_returns_session(self, session):
@@ -386,6 +436,146 @@ class TestDiscoverSessionsMtimeFilter:
         assert sessions == []
 
 
+# ---------------------------------------------------------------------------
+# discover_sessions -- parse cache
+# ---------------------------------------------------------------------------
+
+
+class TestDiscoverSessionsParseCache:
+    """Tests for reuse of parsed sessions across discover_sessions calls."""
+
+    def test_unchanged_file_not_reparsed(self, tmp_path):
+        """A second pass reuses the parse of an unchanged file and re-parses
+        it once it grows."""
+        project_dir = tmp_path / ".claude" / "projects" / "test-project"
+        project_dir.mkdir(parents=True)
+        f = project_dir / "s1.jsonl"
+        f.write_text(
+            '{"type": "user", "sessionId": "s1", "timestamp": "2026-01-01T00:00:00Z", '
+            '"message": {"role": "user", "content": "msg1"}}\n'
+        )
+
+        mock_claude_dir = tmp_path / ".claude" / "projects"
+        with (
+            mock.patch("sessionbook.jsonl.CLAUDE_DIR", mock_claude_dir),
+            mock.patch(
+                "sessionbook.jsonl.parse_session", wraps=parse_session
+            ) as mock_parse,
+        ):
+            first = discover_sessions(project_dir, 0)
+            second = discover_sessions(project_dir, 0)
+            assert mock_parse.call_count == 1
+            assert second[0] is first[0]
+
+            with open(f, "a") as fh:
+                fh.write(
+                    '{"type": "user", "sessionId": "s1", '
+                    '"timestamp": "2026-01-01T00:01:00Z", '
+                    '"message": {"role": "user", "content": "msg2"}}\n'
+                )
+            third = discover_sessions(project_dir, 0)
+
+        assert mock_parse.call_count == 2
+        assert len(third[0].turns) == 2
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        """The cache stays within its size cap, dropping the oldest files
+        while still returning every session of the current pass."""
+        project_dir = tmp_path / ".claude" / "projects" / "test-project"
+        project_dir.mkdir(parents=True)
+        for i in range(3):
+            (project_dir / f"s{i}.jsonl").write_text(
+                f'{{"type": "user", "sessionId": "s{i}", "timestamp": "t", '
+                '"message": {"role": "user", "content": "hi"}}\n'
+            )
+
+        mock_claude_dir = tmp_path / ".claude" / "projects"
+        with (
+            mock.patch("sessionbook.jsonl.CLAUDE_DIR", mock_claude_dir),
+            mock.patch("sessionbook.jsonl._PARSE_CACHE_SIZE", 2),
+            mock.patch.dict("sessionbook.jsonl._parse_cache", clear=True),
+        ):
+            from sessionbook import jsonl
+
+            sessions = discover_sessions(project_dir, 0, parallel=False)
+            cached = list(jsonl._parse_cache)
+
+        assert [s.session_id for s in sessions] == ["s0", "s1", "s2"]
+        assert cached == [project_dir / "s1.jsonl", project_dir / "s2.jsonl"]
+
+    def test_previous_stats_skips_changing_files(self, tmp_path):
+        """With previous_stats, a file is only parsed once it is unchanged
+        since the previous pass."""
+        project_dir = tmp_path / ".claude" / "projects" / "test-project"
+        project_dir.mkdir(parents=True)
+        f = project_dir / "s1.jsonl"
+        line = (
+            '{"type": "user", "sessionId": "s1", "timestamp": "2026-01-01T00:00:00Z", '
+            '"message": {"role": "user", "content": "msg"}}\n'
+        )
+        f.write_text(line)
+
+        mock_claude_dir = tmp_path / ".claude" / "projects"
+        previous_stats: dict = {}
+        with (
+            mock.patch("sessionbook.jsonl.CLAUDE_DIR", mock_claude_dir),
+            mock.patch.dict("sessionbook.jsonl._parse_cache", clear=True),
+        ):
+            first = discover_sessions(project_dir, 0, previous_stats=previous_stats)
+            with open(f, "a") as fh:
+                fh.write(line)
+            second = discover_sessions(project_dir, 0, previous_stats=previous_stats)
+            third = discover_sessions(project_dir, 0, previous_stats=previous_stats)
+
+        assert first == []
+        assert second == []
+        assert len(third) == 1
+        assert len(third[0].turns) == 2
+
+
+class TestDiscoverSessionsParallel:
+    """Tests for parsing session files across worker processes."""
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Parallel and sequential discovery return the same sessions in the
+        same order."""
+        project_dir = tmp_path / ".claude" / "projects" / "test-project"
+        project_dir.mkdir(parents=True)
+        for fixture in sorted(FIXTURES.glob("*.jsonl")):
+            (project_dir / fixture.name).write_bytes(fixture.read_bytes())
+
+        mock_claude_dir = tmp_path / ".claude" / "projects"
+        with mock.patch("sessionbook.jsonl.CLAUDE_DIR", mock_claude_dir):
+            with (
+                mock.patch.dict("sessionbook.jsonl._parse_cache", clear=True),
+                mock.patch("sessionbook.jsonl._PARALLEL_PARSE_BYTES_THRESHOLD", 0),
+            ):
+                parallel = discover_sessions(project_dir, 0, parallel=True)
+            with mock.patch.dict("sessionbook.jsonl._parse_cache", clear=True):
+                sequential = discover_sessions(project_dir, 0, parallel=False)
+
+        assert len(parallel) > 1
+        assert parallel == sequential
+
+    def test_small_batch_parsed_sequentially(self, tmp_path):
+        """Files totalling less than the size threshold skip the worker pool."""
+        project_dir = tmp_path / ".claude" / "projects" / "test-project"
+        project_dir.mkdir(parents=True)
+        for fixture in sorted(FIXTURES.glob("*.jsonl")):
+            (project_dir / fixture.name).write_bytes(fixture.read_bytes())
+
+        mock_claude_dir = tmp_path / ".claude" / "projects"
+        with (
+            mock.patch("sessionbook.jsonl.CLAUDE_DIR", mock_claude_dir),
+            mock.patch.dict("sessionbook.jsonl._parse_cache", clear=True),
+            mock.patch("sessionbook.jsonl.ProcessPoolExecutor") as pool,
+        ):
+            sessions = discover_sessions(project_dir, 0, parallel=True)
+
+        pool.assert_not_called()
+        assert len(sessions) > 1
+
+
 # ---------------------------------------------------------------------------
 # Entry filtering: isMeta, isSidechain, unknown type
 # ---------------------------------------------------------------------------
@@ -570,6 +760,114 @@ class TestSchemaResilience:
         assert len(session.turns) == 1
         assert session.turns[0].text == "real"
 
+    def test_non_string_entry_type_skipped(self, tmp_path):
+        """An entry whose type is a list is skipped, not a crash."""
+        f = tmp_path / "list_type.jsonl"
+        f.write_text(
+            '{"type": ["user"], "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "odd"}}\n'
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "real"}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+
+    def test_non_string_assistant_block_type_skipped(self, tmp_path):
+        """An assistant content block whose type is a list is ignored."""
+        f = tmp_path / "list_block_type.jsonl"
+        f.write_text(
+            '{"type": "assistant", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "assistant", "content": ['
+            '{"type": ["text"], "text": "odd"}, {"type": "text", "text": "real"}]}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+
+    def test_non_string_user_block_type_kept(self, tmp_path):
+        """A user content block whose type is an object does not crash the
+        tool-result scan."""
+        f = tmp_path / "dict_block_type.jsonl"
+        f.write_text(
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": ['
+            '{"type": {"a": 1}}, {"type": "text", "text": "real"}]}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+
+
+class TestLinePrefilter:
+    """Tests for the byte-level pre-filter ahead of JSON decoding."""
+
+    def test_non_candidate_lines_not_decoded(self, tmp_path):
+        """Lines without a user/assistant/progress marker skip decoding."""
+        from sessionbook import jsonl
+
+        f = tmp_path / "prefilter.jsonl"
+        f.write_text(
+            '{"type": "summary", "summary": "A session"}\n'
+            '{"type": "file-history-snapshot", "snapshot": {}}\n'
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "real"}}\n'
+        )
+        with mock.patch.object(jsonl, "_json_loads", wraps=jsonl._json_loads) as loads:
+            session = parse_session(f)
+        assert loads.call_count == 1
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+
+    def test_garbage_line_still_warned(self, tmp_path, caplog):
+        """Lines that are not JSON objects are reported even though they
+        hold no marker."""
+        f = tmp_path / "garbage.jsonl"
+        f.write_text(
+            "not json at all\n"
+            "\n"
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "real"}}\n'
+        )
+        with caplog.at_level(logging.WARNING, logger="sessionbook"):
+            session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+        assert [r.getMessage() for r in caplog.records] == [
+            "Skipping malformed line 1 in garbage.jsonl"
+        ]
+
+    def test_truncated_line_without_marker_warned(self, tmp_path, caplog):
+        """A final line cut short by a crash is reported even though it holds
+        no marker, as is a brace-wrapped line that is not JSON."""
+        f = tmp_path / "truncated.jsonl"
+        f.write_text(
+            "{not valid json}\n"
+            '{"type": "user", "sessionId": "s", "timestamp": "t", '
+            '"message": {"role": "user", "content": "real"}}\n'
+            '{"parentUuid":"abc","isSidechain":false'
+        )
+        with caplog.at_level(logging.WARNING, logger="sessionbook"):
+            session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["real"]
+        assert [r.getMessage() for r in caplog.records] == [
+            "Skipping malformed line 1 in truncated.jsonl",
+            "Skipping malformed line 3 in truncated.jsonl",
+        ]
+
+    def test_nested_sidechain_key_does_not_drop_entry(self, tmp_path):
+        """isSidechain inside nested data does not hide the outer entry."""
+        f = tmp_path / "nested.jsonl"
+        f.write_text(
+            '{"type":"user","sessionId":"s","timestamp":"t",'
+            '"toolUseResult":{"isSidechain":true},'
+            '"message":{"role":"user","content":"kept"}}\n'
+        )
+        session = parse_session(f)
+        assert session is not None
+        assert [t.text for t in session.turns] == ["kept"]
+
 
 class TestUserListContent:
     """Tests for extracting text from user list content."""
@@ -675,8 +973,9 @@ class TestCommandFiltering:
 class TestParseThinkingBlocks:
     """Tests for thinking block extraction (TASK-002)."""
 
-    @pytest.fixture()
-    def session(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def session(cls):
         return parse_session(FIXTURES / "tool_use_session.jsonl")
 
     def test_thinking_blocks_extracted(self, session):
@@ -712,6 +1011,13 @@ class TestTurnDefaults:
         turn = Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")
         assert turn.sub_agent_refs == []
 
+    def test_no_instance_dict(self):
+        """Turn uses slots, so instances carry no per-object __dict__."""
+        turn = Turn(role="user", text="Test", timestamp="2026-02-07T10:00:00Z")
+        assert not hasattr(turn, "__dict__")
+        with pytest.raises(AttributeError):
+            turn.extra = 1  # type: ignore[attr-defined]
+
 
 class TestSubAgentRefDataclass:
     """Tests for SubAgentRef dataclass."""